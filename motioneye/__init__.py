@@ -1,4 +1,4 @@
-VERSION = "0.43.1b49"
+VERSION = "0.43.1b155"
 
 # Ensure UI extensions (additional sections/configs) are registered at import time
 # Importing here guarantees sections are available even if server imports change
@@ -5,126 +5,375 @@ This module provides:
 - Helper functions for audio device selection in RTSP server config
 """
 
+import contextlib
+import functools
 import logging
+import os
 import re
+import shutil
+import signal
 import subprocess
+import threading
 import time
-from typing import List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-# Cache for detected audio devices
-_audio_devices_cache: Optional[List[Tuple[str, str]]] = None
-_audio_devices_cache_time: float = 0
+# Patterns used to parse `arecord -l` output, e.g.:
+# card 1: HD5000 [Microsoft® LifeCam HD-5000], device 0: USB Audio [USB Audio]
+# Output is parsed as bytes; only the surfaced fields are decoded.
+_CARD_LINE_RE = re.compile(rb'card\s+(\d+):\s+(\S+)\s+\[([^\]]+)\],\s*device\s+(\d+):\s*(.+)')
+_CARD_HEAD_RE = re.compile(rb'card\s+(\d+)(?::\s+(\S+))?')  # card number and short name
+_DEV_NUM_RE = re.compile(rb'device\s+(\d+)')
+_DESC_RE = re.compile(rb'\[([^\]]+)\]')
 
+# Patterns used to read capture devices straight from /proc/asound (fallback
+# for lines the string-based parsers can't split), e.g.:
+# cards: " 1 [HD5000         ]: USB-Audio - Microsoft® LifeCam HD-5000"
+# pcm:   "01-00: USB Audio : USB Audio : capture 1"
+_PROC_ASOUND = "/proc/asound"
+_PROC_CARD_RE = re.compile(r'\s*(\d+)\s+\[[^\]]*\]:\s*\S+\s+-\s+(.+)')
+_PROC_PCM_RE = re.compile(r'(\d+)-(\d+):[^:]*:[^:]*:.*\bcapture\b')
+
+# Detected devices are cached for this many seconds (shorter when none found)
+_AUDIO_DEVICES_TTL = 30
+_AUDIO_DEVICES_EMPTY_TTL = 5
+
+_DEFAULT_AUDIO_DEVICE = ("plug:default", "Default Audio Device")
+
+# Resolved once; None when ALSA utils aren't installed
+_ARECORD = shutil.which("arecord")
+
+# arecord is given at most _ARECORD_TIMEOUT seconds (less once it's known to be
+# quick); after a timeout it isn't run again for _ARECORD_BACKOFF seconds
+_ARECORD_TIMEOUT = 1.5
+_ARECORD_MIN_TIMEOUT = 0.5
+_ARECORD_BACKOFF = 60
+
+_arecord_timeout = _ARECORD_TIMEOUT
+_arecord_backoff_until = 0.0
+
+# Background detection for callers that must not block (UI rendering)
+_detect_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-detect")
+_detect_future: Optional[Future] = None
+
+
+def _parse_card_line_re(line: bytes) -> Optional[Tuple[bytes, bytes, bytes]]:
+    """Regex fallback for `arecord -l` lines the fast path couldn't split.
 
-def detect_audio_devices() -> List[Tuple[str, str]]:
-    """Detect available ALSA audio input devices.
-    
     Returns:
-        List of tuples (device_id, device_name) for available capture devices.
-        Example: [("plughw:0,0", "USB Audio Device"), ("plughw:1,0", "Built-in Microphone")]
+        Tuple (card_num, device_num, friendly_name) or None if unparseable.
+    """
+    line_match = _CARD_LINE_RE.match(line)
+    if line_match:
+        card_num, _, friendly_name, device_num, _ = line_match.groups()
+        return card_num, device_num, friendly_name.strip()
+
+    card_match = _CARD_HEAD_RE.search(line)
+    device_match = _DEV_NUM_RE.search(line)
+    if not card_match or not device_match:
+        return None
+
+    card_num = card_match.group(1)
+    desc_match = _DESC_RE.search(line)
+    if desc_match:
+        friendly_name = desc_match.group(1).strip()
+    else:
+        # Fallback: the short name between ":" and "["
+        friendly_name = card_match.group(2) or b"Card " + card_num
+
+    return card_num, device_match.group(1), friendly_name
+
+
+def _ttl_cache(ttl: float, empty_ttl: float) -> Callable:
+    """Memoize a no-argument function for `ttl` seconds.
+
+    Empty (falsy) results are only kept for `empty_ttl` seconds so that a
+    transient failure doesn't hide devices for the full TTL. The wrapper gets
+    a `cache_clear()` method to force the next call to recompute.
+    """
+    def decorator(func: Callable) -> Callable:
+        lock = threading.Lock()
+        entry: List[Optional[Tuple[float, Any]]] = [None]  # (expiry, value)
+
+        @functools.wraps(func)
+        def wrapper():
+            cached = entry[0]
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
+            with lock:
+                cached = entry[0]
+                if cached is not None and time.monotonic() < cached[0]:
+                    return cached[1]
+
+                value = func()
+                entry[0] = (time.monotonic() + (ttl if value else empty_ttl), value)
+                return value
+
+        def cache_clear():
+            entry[0] = None
+
+        def peek():
+            cached = entry[0]
+            if cached is None:
+                return None, False
+            return cached[1], time.monotonic() < cached[0]
+
+        wrapper.cache_clear = cache_clear
+        wrapper.peek = peek
+        return wrapper
+
+    return decorator
+
+
+def _parse_arecord(stdout: bytes) -> List[Tuple[str, str]]:
+    """Parse `arecord -l` output into (device_id, device_name) tuples.
+
+    Parses lines like:
+    card 1: HD5000 [Microsoft® LifeCam HD-5000], device 0: USB Audio [USB Audio]
+    """
+    # Keyed by device id; the first name seen for a device wins
+    devices: Dict[str, str] = {}
+    lines = stdout.split(b'\n')
+    logging.debug("processing %d lines from arecord output", len(lines))
+
+    for line in lines:
+        line = line.strip()
+
+        # Cheap prescreen: skip lines that can't describe a capture device
+        if not line.startswith(b'card ') or b', device ' not in line:
+            continue
+
+        logging.debug("parsing card line: %r", line)
+
+        # Format: "card N: NAME [DESC], device M: SUBNAME [SUBDESC]"
+        head, _, tail = line.partition(b', device ')
+        card_num = head.partition(b':')[0][5:].strip()
+        device_num = tail.partition(b':')[0].strip()
+        lb = head.find(b'[')
+        rb = head.find(b']', lb)
+
+        if card_num.isdigit() and device_num.isdigit() and 0 <= lb < rb:
+            friendly_name = head[lb + 1:rb].strip()
+        else:
+            parsed = _parse_card_line_re(line)
+            if not parsed:
+                logging.warning("could not parse card/device numbers from: %r", line)
+                continue
+            card_num, device_num, friendly_name = parsed
+
+        # card_num and device_num are ASCII digits at this point
+        plug_device_id = f"plughw:{card_num.decode()},{device_num.decode()}"
+        friendly_name = friendly_name.decode('utf-8', 'replace')
+        devices.setdefault(plug_device_id, friendly_name)
+        logging.debug("detected audio device: %s = %s", plug_device_id, friendly_name)
+
+    return list(devices.items())
+
+
+def _parse_proc_card_line(line: str) -> Optional[Tuple[int, str]]:
+    """Parse a `/proc/asound/cards` line into (card_num, card_name)."""
+    # Fast path: " N [ID             ]: DRIVER - NAME"
+    num, _, rest = line.lstrip().partition(' ')
+    if not num.isdigit():
+        return None  # continuation line (long name)
+
+    rb = rest.find(']:')
+    dash = rest.find(' - ', rb)
+    if rest.startswith('[') and 0 <= rb < dash:
+        return int(num), rest[dash + 3:].strip()
+
+    card_match = _PROC_CARD_RE.match(line)
+    if card_match:
+        return int(card_match.group(1)), card_match.group(2).strip()
+    return None
+
+
+def _parse_proc_pcm_line(line: str) -> Optional[Tuple[int, int]]:
+    """Parse a `/proc/asound/pcm` line into (card_num, device_num) for
+    capture-capable PCMs."""
+    # Fast path: "CC-DD: ID : NAME : playback N : capture N"
+    head, _, rest = line.partition(':')
+    card_num, _, device_num = head.partition('-')
+    if not card_num.isdigit() or not device_num.isdigit() or 'capture' not in rest:
+        return None
+
+    if ': capture ' in rest:
+        return int(card_num), int(device_num)
+
+    pcm_match = _PROC_PCM_RE.match(line)
+    if pcm_match:
+        return int(pcm_match.group(1)), int(pcm_match.group(2))
+    return None
+
+
+def _parse_proc_asound(cards: str, pcm: str) -> List[Tuple[str, str]]:
+    """Parse `/proc/asound/cards` and `/proc/asound/pcm` contents into
+    (device_id, device_name) tuples for capture-capable PCMs."""
+    card_names = {}
+    for line in cards.splitlines():
+        card = _parse_proc_card_line(line)
+        if card:
+            card_names[card[0]] = card[1]
+
+    devices: Dict[str, str] = {}
+    for line in pcm.splitlines():
+        pcm_device = _parse_proc_pcm_line(line)
+        if not pcm_device:
+            continue
+
+        card_num, device_num = pcm_device
+        devices.setdefault(
+            f"plughw:{card_num},{device_num}", card_names.get(card_num, f"Card {card_num}")
+        )
+
+    return list(devices.items())
+
+
+def _read_proc_asound() -> Optional[List[Tuple[str, str]]]:
+    """Enumerate capture devices from /proc/asound without spawning a process.
+
+    Returns None when /proc/asound can't be read (no ALSA, or not Linux).
     """
-    global _audio_devices_cache, _audio_devices_cache_time
-    
-    # Cache for 30 seconds to avoid repeated subprocess calls
-    if _audio_devices_cache is not None and (time.time() - _audio_devices_cache_time) < 30:
-        return _audio_devices_cache
-    
-    devices: List[Tuple[str, str]] = []
-    
     try:
-        # Parse arecord -l output for capture devices
-        result = subprocess.run(
-            ["arecord", "-l"],
-            capture_output=True,
-            text=True,
-            timeout=5
+        with open(os.path.join(_PROC_ASOUND, "cards"), errors="replace") as f:
+            cards = f.read()
+        with open(os.path.join(_PROC_ASOUND, "pcm"), errors="replace") as f:
+            pcm = f.read()
+
+    except OSError:
+        return None
+
+    return _parse_proc_asound(cards, pcm)
+
+
+def _last_known_devices() -> List[Tuple[str, str]]:
+    devices, _ = _detect_audio_devices_uncached.peek()
+    return devices or []
+
+
+@_ttl_cache(ttl=_AUDIO_DEVICES_TTL, empty_ttl=_AUDIO_DEVICES_EMPTY_TTL)
+def _detect_audio_devices_uncached() -> List[Tuple[str, str]]:
+    """Return the real capture devices (possibly none).
+
+    Devices are read from /proc/asound; `arecord -l` is only run when that
+    isn't available.
+    """
+    global _arecord_timeout, _arecord_backoff_until
+
+    devices = _read_proc_asound()
+    if devices is not None:
+        return devices
+
+    if _ARECORD is None:
+        logging.debug("arecord not found - ALSA utils not installed (normal on non-Linux)")
+        return []
+
+    if time.monotonic() < _arecord_backoff_until:
+        # arecord hung recently, don't spawn another one yet
+        return _last_known_devices()
+
+    started = time.monotonic()
+    try:
+        process = subprocess.Popen(
+            [_ARECORD, "-l"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
         )
-        
-        logging.info(f"arecord -l returncode: {result.returncode}")
-        logging.info(f"arecord -l stdout length: {len(result.stdout) if result.stdout else 0}")
-        logging.info(f"arecord -l stdout: {repr(result.stdout[:200]) if result.stdout else 'EMPTY'}")
-        if result.stderr:
-            logging.info(f"arecord -l stderr: {result.stderr}")
-        
-        if result.returncode == 0 and result.stdout and result.stdout.strip():
-            lines = result.stdout.split('\n')
-            logging.info(f"Processing {len(lines)} lines from arecord output")
-            
-            # Parse output like:
-            # card 1: HD5000 [Microsoft® LifeCam HD-5000], device 0: USB Audio [USB Audio]
-            for i, line in enumerate(lines):
-                original_line = line
-                line = line.strip()
-                
-                logging.info(f"Line {i}: '{line[:50]}...' startswith card: {line.lower().startswith('card')}")
-                
-                # Skip non-card lines
-                if not line.lower().startswith('card'):
-                    continue
-                    
-                logging.info(f"Processing card line: '{line}'")
-                
-                # Simpler parsing: split by known delimiters
-                # Format: "card N: NAME [DESC], device M: SUBNAME [SUBDESC]"
-                try:
-                    # Extract card number
-                    card_match = re.search(r'card\s+(\d+)', line)
-                    device_match = re.search(r'device\s+(\d+)', line)
-                    
-                    if card_match and device_match:
-                        card_num = card_match.group(1)
-                        device_num = device_match.group(1)
-                        
-                        # Extract description from first [brackets]
-                        desc_match = re.search(r'\[([^\]]+)\]', line)
-                        if desc_match:
-                            friendly_name = desc_match.group(1).strip()
-                        else:
-                            # Fallback: extract name between ":" and "["
-                            name_match = re.search(r'card\s+\d+:\s+(\S+)', line)
-                            friendly_name = name_match.group(1) if name_match else f"Card {card_num}"
-                        
-                        plug_device_id = f"plughw:{card_num},{device_num}"
-                        devices.append((plug_device_id, friendly_name))
-                        logging.info(f"Detected audio device: {plug_device_id} = {friendly_name}")
-                    else:
-                        logging.warning(f"Could not parse card/device numbers from: {line}")
-                        
-                except Exception as parse_error:
-                    logging.warning(f"Error parsing line '{line}': {parse_error}")
-                    
+        stdout, _ = process.communicate(timeout=_arecord_timeout)
+
     except subprocess.TimeoutExpired:
-        logging.warning("Timeout detecting audio devices")
+        logging.warning(
+            "Timeout detecting audio devices, retrying in %d seconds", _ARECORD_BACKOFF
+        )
+        with contextlib.suppress(OSError):
+            os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+        _arecord_timeout = _ARECORD_TIMEOUT
+        _arecord_backoff_until = time.monotonic() + _ARECORD_BACKOFF
+        return _last_known_devices()
+
     except FileNotFoundError:
         logging.debug("arecord not found - ALSA utils not installed (normal on non-Linux)")
+        return []
+
     except Exception as e:
-        logging.error(f"Error detecting audio devices: {e}")
-    
+        logging.error("Error detecting audio devices: %s", e)
+        return []
+
+    # Follow the actual arecord run time, so a wedged ALSA is detected sooner
+    elapsed = time.monotonic() - started
+    _arecord_timeout = min(_ARECORD_TIMEOUT, max(_ARECORD_MIN_TIMEOUT, elapsed * 4))
+
+    logging.debug("arecord -l returned %d (%d bytes)", process.returncode, len(stdout or b""))
+
+    if process.returncode != 0 or not stdout:
+        return []
+
+    return _parse_arecord(stdout)
+
+
+def detect_audio_devices() -> List[Tuple[str, str]]:
+    """Detect available ALSA audio input devices.
+
+    Results are cached for 30 seconds (5 seconds when nothing was found).
+
+    Returns:
+        List of tuples (device_id, device_name) for available capture devices.
+        Example: [("plughw:0,0", "USB Audio Device"), ("plughw:1,0", "Built-in Microphone")]
+    """
+    devices = _detect_audio_devices_uncached()
+
     # Add "Default" option only if no real devices found
     if not devices:
         logging.warning("No audio devices detected, adding default fallback")
-        devices.append(("plug:default", "Default Audio Device"))
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_devices = []
-    for device_id, name in devices:
-        if device_id not in seen:
-            seen.add(device_id)
-            unique_devices.append((device_id, name))
-    
-    _audio_devices_cache = unique_devices
-    _audio_devices_cache_time = time.time()
-    
-    return unique_devices
-
-
-def get_default_audio_device() -> str:
+        return [_DEFAULT_AUDIO_DEVICE]
+
+    return devices
+
+
+def detect_audio_devices_nowait() -> List[Tuple[str, str]]:
+    """Non-blocking variant of `detect_audio_devices()` for UI rendering.
+
+    Returns the cached (possibly stale) device list right away and, when the
+    cache has expired, schedules a rescan in the background.
+    """
+    global _detect_future
+
+    devices, fresh = _detect_audio_devices_uncached.peek()
+    if not fresh and (_detect_future is None or _detect_future.done()):
+        _detect_future = _detect_executor.submit(_detect_audio_devices_uncached)
+
+    return devices or [_DEFAULT_AUDIO_DEVICE]
+
+
+def warm_up() -> None:
+    """Start detecting audio devices in the background.
+
+    Called at startup so that the first settings page doesn't find an
+    empty cache.
+    """
+    detect_audio_devices_nowait()
+
+
+def invalidate_audio_devices() -> None:
+    """Drop the cached device list so the next detection rescans."""
+    _detect_audio_devices_uncached.cache_clear()
+
+
+def get_default_audio_device(devices: Optional[List[Tuple[str, str]]] = None) -> str:
     """Get the default audio device.
-    
-    Returns the first real detected device (not plug:default) or 'plughw:0,0' if none found.
+
+    Returns the first real detected device (not plug:default) or 'plug:default' if none found.
+
+    Args:
+        devices: Device list to pick from, as returned by one of the detection
+            functions (detected with `detect_audio_devices()` when omitted).
     """
-    devices = detect_audio_devices()
+    if devices is None:
+        devices = detect_audio_devices()
     # Skip the "Default Audio Device" entry and get first real device
     for device_id, _ in devices:
         if device_id != "plug:default" and device_id.startswith(("plughw:", "hw:")):
@@ -32,46 +32,63 @@ Persistent configuration via /boot/config.txt:
 TODO: Implement actual LED control functionality
 """
 
+import functools
 import logging
 import os
+import types
 
 from motioneye import settings
 from motioneye.config import additional_config, additional_section
+from motioneye.utils import read_small_file
 
 # LED paths on Raspberry Pi
-LED_PATHS = {
-    'power': ['/sys/class/leds/PWR', '/sys/class/leds/led1'],
-    'activity': ['/sys/class/leds/ACT', '/sys/class/leds/led0'],
-}
+LED_PATHS = types.MappingProxyType({
+    'power': ('/sys/class/leds/PWR', '/sys/class/leds/led1'),
+    'activity': ('/sys/class/leds/ACT', '/sys/class/leds/led0'),
+})
 
 # Boot config file for persistent settings
 BOOT_CONFIG = '/boot/config.txt'
 
+# Default LED settings, shared by the getter and the setter
+_LED_DEFAULTS = types.MappingProxyType({
+    'ledPowerEnabled': True,  # PLACEHOLDER
+    'ledPowerMode': 'default',
+    'ledActivityEnabled': True,  # PLACEHOLDER
+    'ledActivityMode': 'mmc0',
+})
+
+
+# Result of the device tree model probe (None until probed)
+_is_rpi_model = None
+
 
 def _is_raspberry_pi():
     """
     Check if running on a Raspberry Pi.
     Also returns True if FORCE_HARDWARE_SETTINGS is enabled in settings.
+    The device tree model is only probed once per process.
     """
+    global _is_rpi_model
+
     # Check for force flag in settings (useful for development/testing)
     if getattr(settings, 'FORCE_HARDWARE_SETTINGS', False):
         return True
-    
-    try:
-        with open('/proc/device-tree/model', 'r') as f:
-            model = f.read()
-            return 'Raspberry Pi' in model
-    except Exception:
-        pass
-    
-    # Alternative check via /sys/firmware/devicetree/base/model
-    try:
-        with open('/sys/firmware/devicetree/base/model', 'r') as f:
-            model = f.read()
-            return 'Raspberry Pi' in model
-    except Exception:
-        pass
-    
+
+    if _is_rpi_model is None:
+        _is_rpi_model = _probe_raspberry_pi_model()
+
+    return _is_rpi_model
+
+
+def _probe_raspberry_pi_model():
+    # The second path is the alternative location of the same device tree node
+    for path in ('/proc/device-tree/model', '/sys/firmware/devicetree/base/model'):
+        try:
+            return b'Raspberry Pi' in read_small_file(path)
+        except OSError:
+            pass
+
     return False
 
 
@@ -80,9 +97,12 @@ def _get_led_path(led_type):
     Get the sysfs path for a LED type.
     Returns None if LED not found.
     """
-    for path in LED_PATHS.get(led_type, []):
-        if os.path.exists(path):
-            return path
+    for path in LED_PATHS.get(led_type, ()):
+        try:
+            os.stat(path)
+        except OSError:
+            continue
+        return path
     return None
 
 
@@ -114,12 +134,7 @@ def _get_led_settings():
     """
     Get current LED settings.
     """
-    return {
-        'ledPowerEnabled': True,  # PLACEHOLDER
-        'ledPowerMode': 'default',
-        'ledActivityEnabled': True,  # PLACEHOLDER
-        'ledActivityMode': 'mmc0',
-    }
+    return dict(_LED_DEFAULTS)
 
 
 def _set_led_settings(s):
@@ -128,14 +143,12 @@ def _set_led_settings(s):
     
     TODO: Implement persistent configuration
     """
-    s.setdefault('ledPowerEnabled', True)
-    s.setdefault('ledPowerMode', 'default')
-    s.setdefault('ledActivityEnabled', True)
-    s.setdefault('ledActivityMode', 'mmc0')
+    for key, value in _LED_DEFAULTS.items():
+        s.setdefault(key, value)
     
     logging.info(
-        f'[PLACEHOLDER] LED settings: power={s["ledPowerEnabled"]}, '
-        f'activity={s["ledActivityEnabled"]}'
+        '[PLACEHOLDER] LED settings: power=%s, activity=%s',
+        s['ledPowerEnabled'], s['ledActivityEnabled']
     )
     
     # TODO: Write to /boot/config.txt for persistence
@@ -146,6 +159,21 @@ def _set_led_settings(s):
 # Additional Config Definitions for UI
 # ============================================================================
 
+def _rpi_only(func):
+    """
+    Hide a UI config item when not running on a Raspberry Pi.
+    The check runs when the config structure is built, after settings are loaded.
+    """
+    @functools.wraps(func)
+    def wrapper():
+        if not _is_raspberry_pi():
+            return None
+
+        return func()
+
+    return wrapper
+
+
 @additional_section
 def hardware():
     return {
@@ -197,10 +225,8 @@ def led_separator():
 
 
 @additional_config
+@_rpi_only
 def led_activity_enabled():
-    if not _is_raspberry_pi():
-        return None
-    
     return {
         'label': 'Activity LED',
         'description': 'enable or disable the activity LED (green LED, SD card activity) [PLACEHOLDER]',
@@ -214,10 +240,8 @@ def led_activity_enabled():
 
 
 @additional_config
+@_rpi_only
 def led_activity_mode():
-    if not _is_raspberry_pi():
-        return None
-    
     return {
         'label': 'Activity LED Mode',
         'description': 'behavior of the activity LED [PLACEHOLDER]',
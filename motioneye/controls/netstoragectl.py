@@ -28,17 +28,31 @@ TODO: Implement actual network storage functionality
 
 import logging
 import os
+import types
 
 from motioneye import settings
 from motioneye.config import additional_config, additional_section
 
 # Supported storage protocols
-STORAGE_PROTOCOLS = [
+STORAGE_PROTOCOLS = (
     ('local', 'Local Storage (SD Card)'),
     ('smb', 'SMB/CIFS (Windows Share)'),
     ('nfs', 'NFS (Network File System)'),
     ('sshfs', 'SSHFS (SSH File System)'),
-]
+)
+
+# Default network storage settings, shared by the getter and the setter
+_NETSTORAGE_DEFAULTS = types.MappingProxyType({
+    'networkStorageEnabled': False,  # PLACEHOLDER
+    'networkStorageProtocol': 'local',
+    'networkStorageServer': '',
+    'networkStorageShare': '',
+    'networkStorageUsername': '',
+    'networkStoragePassword': '',
+    'networkStorageMountPoint': '/media/motioneye_network',
+    'networkStorageFailover': True,
+    'networkStorageReadOnly': False,
+})
 
 
 def _get_network_storage_settings():
@@ -47,17 +61,7 @@ def _get_network_storage_settings():
     
     TODO: Read from persistent configuration
     """
-    return {
-        'networkStorageEnabled': False,  # PLACEHOLDER
-        'networkStorageProtocol': 'local',
-        'networkStorageServer': '',
-        'networkStorageShare': '',
-        'networkStorageUsername': '',
-        'networkStoragePassword': '',
-        'networkStorageMountPoint': '/media/motioneye_network',
-        'networkStorageFailover': True,
-        'networkStorageReadOnly': False,
-    }
+    return dict(_NETSTORAGE_DEFAULTS)
 
 
 def _set_network_storage_settings(s):
@@ -66,19 +70,12 @@ def _set_network_storage_settings(s):
     
     TODO: Implement actual mount/unmount and configuration persistence
     """
-    s.setdefault('networkStorageEnabled', False)
-    s.setdefault('networkStorageProtocol', 'local')
-    s.setdefault('networkStorageServer', '')
-    s.setdefault('networkStorageShare', '')
-    s.setdefault('networkStorageUsername', '')
-    s.setdefault('networkStoragePassword', '')
-    s.setdefault('networkStorageMountPoint', '/media/motioneye_network')
-    s.setdefault('networkStorageFailover', True)
-    s.setdefault('networkStorageReadOnly', False)
+    for key, value in _NETSTORAGE_DEFAULTS.items():
+        s.setdefault(key, value)
     
     logging.info(
-        f'[PLACEHOLDER] Network storage settings: enabled={s["networkStorageEnabled"]}, '
-        f'protocol={s["networkStorageProtocol"]}, server={s["networkStorageServer"]}'
+        '[PLACEHOLDER] Network storage settings: enabled=%s, protocol=%s, server=%s',
+        s['networkStorageEnabled'], s['networkStorageProtocol'], s['networkStorageServer']
     )
     
     # TODO: Validate connection
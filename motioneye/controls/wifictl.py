@@ -24,24 +24,88 @@ Supports both:
 The module auto-detects which network manager is in use.
 """
 
+import csv
+import functools
+import io
 import logging
 import os
 import re
 import shutil
+import socket
+import struct
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from motioneye import settings
 from motioneye.config import additional_config, additional_section
+from motioneye.utils import read_small_file
 
 WPA_SUPPLICANT_CONF = settings.WPA_SUPPLICANT_CONF  # @UndefinedVariable
+DHCPCD_CONF = '/etc/dhcpcd.conf'
 
-# Cache for WiFi interfaces and network manager type
+# Cache for WiFi interfaces, as (monotonic timestamp, interfaces, all interface names),
+# and network manager type
 _wifi_interfaces_cache = None
-_network_manager_type = None  # 'networkmanager', 'dhcpcd', or None
+_WIFI_CACHE_TTL = 30.0  # seconds
+_network_manager_type = None  # 'networkmanager' or 'dhcpcd' once detected for sure
+# monotonic time of the last detection that cleanly found nothing;
+# the probes are run again once _NM_MISS_TTL has passed
+_network_manager_miss_time = None
+_NM_MISS_TTL = 30.0  # seconds
+
+# Cache for the settings shown in the UI, as (monotonic timestamp, settings dict);
+# saves the nmcli calls and file reads when the page is reloaded within the TTL
+_wifi_settings_cache = None
+_WIFI_SETTINGS_CACHE_TTL = 5.0  # seconds
+
+_WIFI_DEFAULTS = {
+    'wifiEnabled': False,
+    'wifiInterface': 'auto',
+    'wifiInterfaceFallback': '',
+    'wifiNetworkName': '',
+    'wifiNetworkKey': '',
+    'wifiNetworkFallback': '',
+    'wifiNetworkKeyFallback': '',
+    'wifiUseDhcp': True,
+    'wifiIpAddress': '',
+    'wifiNetmask': '255.255.255.0',
+    'wifiGateway': '',
+    'wifiDns1': '',
+    'wifiDns2': '',
+}
+
+# Resolved on first use by _get_nmcli(); None when NetworkManager isn't installed
+_nmcli_path = None
+_nmcli_resolved = False
+
+# Imported on first use by _get_dbus(); None when dbus-python isn't installed
+_dbus = None
+_dbus_resolved = False
+
+NM_DBUS_SERVICE = 'org.freedesktop.NetworkManager'
+NM_DBUS_SETTINGS_PATH = '/org/freedesktop/NetworkManager/Settings'
 
 # motionEye connection name prefix for NetworkManager
 NM_CONNECTION_PREFIX = 'motioneye-wifi'
 
+# Environment for detection commands whose output we parse (untranslated text)
+_C_LOCALE_ENV = dict(os.environ, LC_ALL='C')
+
+# Interface detection commands are local queries; give up quickly when one hangs
+_DETECT_TIMEOUT = 1.0  # seconds
+# nmcli/systemctl can be slow on a loaded system, and the network manager
+# they detect is remembered, so these probes get more time
+_NM_DETECT_TIMEOUT = 5  # seconds
+
+# Matches the "Interface <name>" lines of `iw dev`
+_IW_IFACE_RE = re.compile(r'^\s*Interface\s+(\S+)')
+
+# wpa_supplicant.conf raw hex keys and motionEye comments
+_WPA_HEX_PSK_RE = re.compile('[a-f0-9]{64}', re.I)
+_WPA_ME_INTERFACE_RE = re.compile(r'#\s*motioneye_interface\s*=\s*(\S+)')
+_WPA_ME_INTERFACE_FALLBACK_RE = re.compile(r'#\s*motioneye_interface_fallback\s*=\s*(\S+)')
+
 
 def _is_wifi_configurable():
     """
@@ -58,40 +122,68 @@ def _is_wifi_configurable():
 # Network Manager Detection
 # ============================================================================
 
+def _get_nmcli():
+    """
+    Return the path to nmcli, looking it up in PATH only the first time.
+    """
+    global _nmcli_path, _nmcli_resolved
+
+    if not _nmcli_resolved:
+        _nmcli_path = shutil.which('nmcli')
+        _nmcli_resolved = True
+
+    return _nmcli_path
+
+
 def _detect_network_manager():
     """
     Detect which network manager is in use.
     Returns: 'networkmanager', 'dhcpcd', or None
     """
-    global _network_manager_type
+    global _network_manager_type, _network_manager_miss_time
 
     if _network_manager_type is not None:
         return _network_manager_type
 
+    if (
+        _network_manager_miss_time is not None
+        and time.monotonic() - _network_manager_miss_time < _NM_MISS_TTL
+    ):
+        return None
+
+    # A probe that timed out or failed proves nothing; such a miss isn't cached
+    probe_failed = False
+
     # Check for NetworkManager first (Raspberry Pi OS Bookworm+)
-    if shutil.which('nmcli'):
+    nmcli = _get_nmcli()
+    if nmcli:
         try:
             result = subprocess.run(
-                ['nmcli', '-t', '-f', 'RUNNING', 'general'],
-                capture_output=True,
+                [nmcli, '-t', '-f', 'RUNNING', 'general'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=5
+                env=_C_LOCALE_ENV,
+                timeout=_NM_DETECT_TIMEOUT
             )
             if result.returncode == 0 and 'running' in result.stdout.lower():
                 _network_manager_type = 'networkmanager'
                 logging.info('detected NetworkManager as network manager')
                 return _network_manager_type
         except Exception as e:
-            logging.debug(f'nmcli check failed: {e}')
+            logging.debug('nmcli check failed: %s', e)
+            probe_failed = True
 
     # Check for dhcpcd (older Raspberry Pi OS)
-    if os.path.exists('/etc/dhcpcd.conf'):
+    if os.path.exists(DHCPCD_CONF):
         try:
             result = subprocess.run(
                 ['systemctl', 'is-active', 'dhcpcd'],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=5
+                env=_C_LOCALE_ENV,
+                timeout=_NM_DETECT_TIMEOUT
             )
             if result.returncode == 0 and 'active' in result.stdout:
                 _network_manager_type = 'dhcpcd'
@@ -99,16 +191,26 @@ def _detect_network_manager():
                 return _network_manager_type
         except Exception:
             # dhcpcd.conf exists but service check failed, still try dhcpcd
-            if os.path.exists('/etc/dhcpcd.conf'):
-                _network_manager_type = 'dhcpcd'
-                logging.info('detected dhcpcd (fallback) as network manager')
-                return _network_manager_type
+            # (a guess, so it isn't cached)
+            logging.info('detected dhcpcd (fallback) as network manager')
+            return 'dhcpcd'
 
     logging.warning('no supported network manager detected')
-    _network_manager_type = None
+    if not probe_failed:
+        _network_manager_miss_time = time.monotonic()
     return None
 
 
+def invalidate_network_manager():
+    """
+    Forget the detected network manager so the next lookup probes it again.
+    """
+    global _network_manager_type, _network_manager_miss_time
+
+    _network_manager_type = None
+    _network_manager_miss_time = None
+
+
 # ============================================================================
 # WiFi Interface Detection
 # ============================================================================
@@ -120,99 +222,165 @@ def _detect_wifi_interfaces():
     """
     global _wifi_interfaces_cache
 
+    now = time.monotonic()
+    if _wifi_interfaces_cache and now - _wifi_interfaces_cache[0] < _WIFI_CACHE_TTL:
+        return _wifi_interfaces_cache[1]
+
+    # Each method is only tried when the previous ones found nothing; the
+    # sysfs scan is cheap and always re-read so driver and operstate stay
+    # current, while the iw/nmcli fallbacks are only spawned again when the
+    # interface names changed (sysfs doesn't emit inotify events)
+    names = _list_net_interfaces()
+    try:
+        interfaces = _detect_wifi_interfaces_sysfs()
+        if not interfaces:
+            if _wifi_interfaces_cache and names is not None and names == _wifi_interfaces_cache[2]:
+                interfaces = _wifi_interfaces_cache[1]
+            else:
+                interfaces = (
+                    _detect_wifi_interfaces_iw()
+                    or _detect_wifi_interfaces_nmcli()
+                )
+    except Exception as e:
+        logging.error(f'error detecting WiFi interfaces: {e}')
+        interfaces = []
+
+    _wifi_interfaces_cache = (now, interfaces, names)
+    return interfaces
+
+
+def _list_net_interfaces():
+    """
+    Return the names of all network interfaces, or None if they can't be listed.
+    """
+    try:
+        return frozenset(os.listdir('/sys/class/net'))
+    except OSError:
+        return None
+
+
+def _detect_wifi_interfaces_sysfs():
+    """
+    Method 1: Check /sys/class/net for wireless interfaces
+    (one directory scan; missing entries are handled by catching errors
+    rather than probing each path with os.path.exists first)
+    """
     interfaces = []
 
     try:
-        # Method 1: Check /sys/class/net for wireless interfaces
-        net_path = '/sys/class/net'
-        if os.path.exists(net_path):
-            for iface in os.listdir(net_path):
-                wireless_path = os.path.join(net_path, iface, 'wireless')
-                if os.path.exists(wireless_path):
-                    # Get driver info
+        with os.scandir('/sys/class/net') as entries:
+            for entry in entries:
+                iface = entry.name
+                try:
+                    os.stat(f'{entry.path}/wireless')
+                except OSError:
+                    continue  # not a wireless interface
+
+                # Get driver info
+                try:
+                    driver = os.path.basename(
+                        os.readlink(f'{entry.path}/device/driver')
+                    )
+                except OSError:
                     driver = 'unknown'
-                    driver_path = os.path.join(net_path, iface, 'device', 'driver')
-                    if os.path.exists(driver_path):
-                        try:
-                            driver = os.path.basename(os.readlink(driver_path))
-                        except Exception:
-                            pass
-
-                    # Check if interface is available
-                    operstate_path = os.path.join(net_path, iface, 'operstate')
+
+                # Check if interface is available
+                try:
+                    state = read_small_file(f'{entry.path}/operstate', 16)
+                    is_available = state.strip() != b'notpresent'
+                except OSError:
                     is_available = True
-                    if os.path.exists(operstate_path):
-                        try:
-                            with open(operstate_path) as f:
-                                state = f.read().strip()
-                                is_available = state not in ['notpresent']
-                        except Exception:
-                            pass
-
-                    interfaces.append((iface, driver, is_available))
-                    logging.debug(
-                        f'detected WiFi interface: {iface} (driver: {driver}, available: {is_available})'
-                    )
 
-        # Method 2: Use iw if /sys method found nothing
-        if not interfaces:
-            try:
-                result = subprocess.run(
-                    ['iw', 'dev'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    for line in result.stdout.splitlines():
-                        m = re.match(r'\s*Interface\s+(\w+)', line)
-                        if m:
-                            iface = m.group(1)
-                            interfaces.append((iface, 'unknown', True))
-                            logging.debug(f'detected WiFi interface via iw: {iface}')
-            except Exception as e:
-                logging.debug(f'iw command failed: {e}')
-
-        # Method 3: Use nmcli if available
-        if not interfaces and shutil.which('nmcli'):
-            try:
-                result = subprocess.run(
-                    ['nmcli', '-t', '-f', 'DEVICE,TYPE', 'device'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
+                interfaces.append((iface, driver, is_available))
+                logging.debug(
+                    'detected WiFi interface: %s (driver: %s, available: %s)',
+                    iface, driver, is_available
                 )
-                if result.returncode == 0:
-                    for line in result.stdout.splitlines():
-                        parts = line.split(':')
-                        if len(parts) >= 2 and parts[1] == 'wifi':
-                            iface = parts[0]
-                            interfaces.append((iface, 'unknown', True))
-                            logging.debug(f'detected WiFi interface via nmcli: {iface}')
-            except Exception as e:
-                logging.debug(f'nmcli device check failed: {e}')
+    except OSError:
+        pass  # no /sys/class/net
 
+    return interfaces
+
+
+def _detect_wifi_interfaces_iw():
+    """
+    Method 2: Use iw if /sys method found nothing
+    """
+    interfaces = []
+
+    try:
+        result = subprocess.run(
+            ['iw', 'dev'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=_C_LOCALE_ENV,
+            timeout=_DETECT_TIMEOUT
+        )
+        if result.returncode == 0:
+            for line in result.stdout.splitlines():
+                m = _IW_IFACE_RE.match(line)
+                if m:
+                    iface = m.group(1)
+                    interfaces.append((iface, 'unknown', True))
+                    logging.debug('detected WiFi interface via iw: %s', iface)
     except Exception as e:
-        logging.error(f'error detecting WiFi interfaces: {e}')
+        logging.debug('iw command failed: %s', e)
+
+    return interfaces
+
+
+def _detect_wifi_interfaces_nmcli():
+    """
+    Method 3: Use nmcli if available
+    """
+    interfaces = []
+    nmcli = _get_nmcli()
+    if not nmcli:
+        return interfaces
+
+    try:
+        result = subprocess.run(
+            [nmcli, '-t', '-f', 'DEVICE,TYPE', 'device'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=_C_LOCALE_ENV,
+            timeout=_DETECT_TIMEOUT
+        )
+        if result.returncode == 0:
+            for parts in _nmcli_terse_rows(result.stdout):
+                if len(parts) >= 2 and parts[1] == 'wifi':
+                    iface = parts[0]
+                    interfaces.append((iface, 'unknown', True))
+                    logging.debug('detected WiFi interface via nmcli: %s', iface)
+    except Exception as e:
+        logging.debug('nmcli device check failed: %s', e)
 
-    _wifi_interfaces_cache = interfaces
     return interfaces
 
 
+def invalidate_wifi_cache():
+    """
+    Forget the detected WiFi interfaces, the detected network manager and the
+    cached WiFi settings so the next lookup reads them again.
+    """
+    global _wifi_interfaces_cache, _wifi_settings_cache
+
+    _wifi_interfaces_cache = None
+    _wifi_settings_cache = None
+    invalidate_network_manager()
+
+
 def get_wifi_interface_choices():
     """
     Returns a list of choices for the UI dropdown.
     Format: [(value, label), ...]
     """
-    interfaces = _detect_wifi_interfaces()
-    choices = [('auto', 'Auto (automatic selection)')]
-
-    for iface, driver, is_available in interfaces:
-        status = '' if is_available else ' (unavailable)'
-        label = f'{iface} ({driver}){status}'
-        choices.append((iface, label))
-
-    return choices
+    return [('auto', 'Auto (automatic selection)')] + [
+        (iface, f'{iface} ({driver}){"" if is_available else " (unavailable)"}')
+        for iface, driver, is_available in _detect_wifi_interfaces()
+    ]
 
 
 def _get_current_interface():
@@ -228,35 +396,88 @@ def _get_current_interface():
 # NetworkManager Functions (Raspberry Pi OS Bookworm+)
 # ============================================================================
 
+def _get_dbus():
+    """
+    Return the dbus module, importing it only the first time.
+    """
+    global _dbus, _dbus_resolved
+
+    if not _dbus_resolved:
+        try:
+            import dbus
+
+            _dbus = dbus
+
+        except ImportError:
+            logging.debug('dbus-python not available, using nmcli for NetworkManager queries')
+
+        _dbus_resolved = True
+
+    return _dbus
+
+
+def _run_nmcli(args, timeout=10):
+    """
+    Run nmcli with the given arguments and capture its output.
+    stdin is not inherited, and the output is decoded as UTF-8 regardless of
+    the locale, replacing bytes that aren't valid (SSIDs may contain any).
+    Raises FileNotFoundError when nmcli isn't installed.
+    """
+    nmcli = _get_nmcli()
+    if not nmcli:
+        raise FileNotFoundError('nmcli not found')
+
+    return subprocess.run(
+        [nmcli] + args,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        encoding='utf-8',
+        errors='replace',
+        timeout=timeout
+    )
+
+
+def _nmcli_terse_rows(output):
+    """
+    Split the tabular output of `nmcli -t` into rows of fields.
+    nmcli escapes ':' and '\\' inside values with a backslash, which a plain
+    split(':') would get wrong (e.g. SSIDs or connection names with colons).
+    """
+    return csv.reader(io.StringIO(output), delimiter=':', escapechar='\\', quoting=csv.QUOTE_NONE)
+
+
 def _nm_get_wifi_connections():
     """
     Get WiFi connections configured via NetworkManager.
     Returns list of dicts with connection info.
     """
+    dbus = _get_dbus()
+    if dbus:
+        try:
+            return _nm_dbus_get_wifi_connections(dbus)
+
+        except Exception as e:
+            logging.debug(f'NetworkManager D-Bus query failed, falling back to nmcli: {e}')
+
     connections = []
 
     try:
         # List all WiFi connections
-        result = subprocess.run(
-            ['nmcli', '-t', '-f', 'NAME,TYPE,DEVICE,AUTOCONNECT-PRIORITY', 'connection', 'show'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        result = _run_nmcli(['-t', '-f', 'NAME,TYPE,DEVICE,AUTOCONNECT-PRIORITY', 'connection', 'show'])
         if result.returncode != 0:
             return connections
 
-        for line in result.stdout.splitlines():
-            parts = line.split(':')
+        priorities = {}
+        for parts in _nmcli_terse_rows(result.stdout):
             if len(parts) >= 2 and '802-11-wireless' in parts[1]:
                 conn_name = parts[0]
                 priority = int(parts[3]) if len(parts) > 3 and parts[3].lstrip('-').isdigit() else 0
+                priorities[conn_name] = priority
 
-                # Get connection details
-                conn_info = _nm_get_connection_details(conn_name)
-                if conn_info:
-                    conn_info['priority'] = priority
-                    connections.append(conn_info)
+        # Get the details of all WiFi connections with a single nmcli call
+        for conn_info in _nm_get_connections_details(list(priorities)):
+            conn_info['priority'] = priorities.get(conn_info['name'], 0)
+            connections.append(conn_info)
 
     except Exception as e:
         logging.error(f'error getting NetworkManager WiFi connections: {e}')
@@ -264,92 +485,196 @@ def _nm_get_wifi_connections():
     return connections
 
 
+def _nm_dbus_get_wifi_connections(dbus):
+    """
+    Get WiFi connections by asking NetworkManager over D-Bus,
+    which avoids spawning nmcli processes.
+    Returns the same dicts as the nmcli based code.
+    """
+    bus = dbus.SystemBus()
+    nm_settings = dbus.Interface(
+        bus.get_object(NM_DBUS_SERVICE, NM_DBUS_SETTINGS_PATH),
+        NM_DBUS_SERVICE + '.Settings'
+    )
+
+    connections = []
+    for path in nm_settings.ListConnections():
+        conn = dbus.Interface(
+            bus.get_object(NM_DBUS_SERVICE, path),
+            NM_DBUS_SERVICE + '.Settings.Connection'
+        )
+        conn_settings = conn.GetSettings()
+        if conn_settings['connection'].get('type') != '802-11-wireless':
+            continue
+
+        psk = ''
+        if '802-11-wireless-security' in conn_settings:
+            try:
+                secrets = conn.GetSecrets('802-11-wireless-security')
+                psk = str(secrets['802-11-wireless-security'].get('psk', ''))
+
+            except dbus.DBusException as e:
+                logging.debug(f'could not get secrets of {path}: {e}')
+
+        connections.append(_nm_dbus_connection_info(conn_settings, psk))
+
+    return connections
+
+
+def _nm_dbus_connection_info(conn_settings, psk):
+    """
+    Convert a NetworkManager settings dict (as returned by GetSettings)
+    to the connection info dict used by this module.
+    """
+    connection = conn_settings['connection']
+    wireless = conn_settings.get('802-11-wireless', {})
+    ipv4 = conn_settings.get('ipv4', {})
+
+    info = {
+        'name': str(connection['id']),
+        'ssid': bytes(bytearray(wireless.get('ssid', []))).decode('utf-8', 'replace'),
+        'psk': psk,
+        'dhcp': ipv4.get('method', 'auto') == 'auto',
+        'priority': int(connection.get('autoconnect-priority', 0)),
+    }
+
+    if connection.get('interface-name'):
+        info['interface'] = str(connection['interface-name'])
+
+    address_data = ipv4.get('address-data', [])
+    if address_data:
+        info['ip_address'] = str(address_data[0]['address'])
+        info['netmask'] = _cidr_to_netmask(int(address_data[0]['prefix']))
+
+    if ipv4.get('gateway'):
+        info['gateway'] = str(ipv4['gateway'])
+
+    # "dns" holds IPv4 addresses as integers in network byte order
+    dns_list = [socket.inet_ntoa(struct.pack('=I', int(d))) for d in ipv4.get('dns', [])]
+    if len(dns_list) >= 1:
+        info['dns1'] = dns_list[0]
+    if len(dns_list) >= 2:
+        info['dns2'] = dns_list[1]
+
+    return info
+
+
+# Connection properties read by _nm_get_connections_details();
+# connection.id comes first as it starts each connection's record
+_NM_DETAIL_FIELDS = ','.join([
+    'connection.id',
+    'connection.interface-name',
+    '802-11-wireless.ssid',
+    '802-11-wireless-security.psk',
+    'ipv4.method',
+    'ipv4.addresses',
+    'ipv4.gateway',
+    'ipv4.dns',
+])
+
+
 def _nm_get_connection_details(conn_name):
     """
     Get detailed info for a NetworkManager connection.
     """
+    details = _nm_get_connections_details([conn_name])
+    return details[0] if details else None
+
+
+def _nm_get_connections_details(conn_names):
+    """
+    Get detailed info for several NetworkManager connections at once.
+    Returns a list of dicts, one per connection found.
+    """
+    if not conn_names:
+        return []
+
+    # Prefix each name with "id" so names like "uuid" aren't taken as keywords
+    args = ['-t', '-s', '-f', _NM_DETAIL_FIELDS, 'connection', 'show']
+    for conn_name in conn_names:
+        args += ['id', conn_name]
+
     try:
-        result = subprocess.run(
-            ['nmcli', '-t', '-s', 'connection', 'show', conn_name],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        result = _run_nmcli(args)
         if result.returncode != 0:
-            return None
+            return []
 
-        info = {'name': conn_name}
+        return _nm_parse_connection_details(result.stdout)
 
-        for line in result.stdout.splitlines():
-            if ':' not in line:
-                continue
+    except Exception as e:
+        logging.debug(f'error getting connection details for {", ".join(conn_names)}: {e}')
+        return []
 
-            key, _, value = line.partition(':')
-            key = key.strip()
-            value = value.strip()
 
-            if key == '802-11-wireless.ssid':
-                info['ssid'] = value
-            elif key == '802-11-wireless-security.psk':
-                info['psk'] = value
-            elif key == 'ipv4.method':
-                info['dhcp'] = (value == 'auto')
-            elif key == 'ipv4.addresses':
-                if value and value != '--':
-                    # Format: "192.168.1.100/24"
-                    ip_cidr = value.split()[0] if ' ' in value else value
-                    if '/' in ip_cidr:
-                        ip, cidr = ip_cidr.split('/')
-                        info['ip_address'] = ip
-                        info['netmask'] = _cidr_to_netmask(int(cidr))
-            elif key == 'ipv4.gateway':
-                if value and value != '--':
-                    info['gateway'] = value
-            elif key == 'ipv4.dns':
-                if value and value != '--':
-                    dns_list = value.replace(',', ' ').split()
-                    if len(dns_list) >= 1:
-                        info['dns1'] = dns_list[0]
-                    if len(dns_list) >= 2:
-                        info['dns2'] = dns_list[1]
-            elif key == 'connection.interface-name':
-                if value and value != '--':
-                    info['interface'] = value
-
-        return info
+def _nm_parse_connection_details(output):
+    """
+    Parse the terse output of `nmcli -s connection show` for one or more
+    connections into a list of dicts.
+    """
+    connections = []
+    info = None
+
+    for line in output.splitlines():
+        if ':' not in line:
+            continue
+
+        key, _, value = line.partition(':')
+        key = key.strip()
+        value = value.strip()
+
+        if key == 'connection.id':
+            info = {'name': value}
+            connections.append(info)
+        elif info is None:
+            continue
+        elif key == '802-11-wireless.ssid':
+            info['ssid'] = value
+        elif key == '802-11-wireless-security.psk':
+            info['psk'] = value
+        elif key == 'ipv4.method':
+            info['dhcp'] = (value == 'auto')
+        elif key == 'ipv4.addresses':
+            if value and value != '--':
+                # Format: "192.168.1.100/24"
+                ip_cidr = value.split()[0] if ' ' in value else value
+                if '/' in ip_cidr:
+                    ip, cidr = ip_cidr.split('/')
+                    info['ip_address'] = ip
+                    info['netmask'] = _cidr_to_netmask(int(cidr))
+        elif key == 'ipv4.gateway':
+            if value and value != '--':
+                info['gateway'] = value
+        elif key == 'ipv4.dns':
+            if value and value != '--':
+                dns_list = value.replace(',', ' ').split()
+                if len(dns_list) >= 1:
+                    info['dns1'] = dns_list[0]
+                if len(dns_list) >= 2:
+                    info['dns2'] = dns_list[1]
+        elif key == 'connection.interface-name':
+            if value and value != '--':
+                info['interface'] = value
 
-    except Exception as e:
-        logging.debug(f'error getting connection details for {conn_name}: {e}')
-        return None
+    return connections
 
 
-def _nm_create_or_update_connection(ssid, psk, interface, priority, ip_config):
+def _nm_create_or_update_connection(ssid, psk, interface, priority, ip_config, replace=True):
     """
     Create or update a NetworkManager WiFi connection.
+
+    Pass replace=False when the caller already knows that no connection
+    with this name exists, to save the delete round-trip.
     """
     conn_name = f'{NM_CONNECTION_PREFIX}-{ssid}'
 
     try:
-        # Check if connection already exists
-        result = subprocess.run(
-            ['nmcli', 'connection', 'show', conn_name],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        exists = (result.returncode == 0)
-
-        if exists:
-            # Delete existing connection
-            subprocess.run(
-                ['nmcli', 'connection', 'delete', conn_name],
-                capture_output=True,
-                timeout=10
-            )
+        if replace:
+            # Delete any existing connection; nmcli simply fails if there is none
+            _run_nmcli(['connection', 'delete', 'id', conn_name])
 
-        # Build nmcli command
-        cmd = [
-            'nmcli', 'connection', 'add',
+        # Build nmcli arguments
+        args = [
+            'connection', 'add',
             'type', 'wifi',
             'con-name', conn_name,
             'ssid', ssid,
@@ -359,41 +684,41 @@ def _nm_create_or_update_connection(ssid, psk, interface, priority, ip_config):
 
         # Interface binding
         if interface and interface != 'auto':
-            cmd.extend(['ifname', interface])
+            args.extend(['ifname', interface])
         else:
-            cmd.extend(['ifname', '*'])
+            args.extend(['ifname', '*'])
 
         # Security
         if psk:
-            cmd.extend([
+            args.extend([
                 'wifi-sec.key-mgmt', 'wpa-psk',
                 'wifi-sec.psk', psk,
             ])
 
         # IP configuration
         if ip_config.get('wifiUseDhcp', True):
-            cmd.extend(['ipv4.method', 'auto'])
+            args.extend(['ipv4.method', 'auto'])
         else:
-            cmd.extend(['ipv4.method', 'manual'])
+            args.extend(['ipv4.method', 'manual'])
 
             ip = ip_config.get('wifiIpAddress', '')
             netmask = ip_config.get('wifiNetmask', '255.255.255.0')
             if ip:
                 cidr = _netmask_to_cidr(netmask)
-                cmd.extend(['ipv4.addresses', f'{ip}/{cidr}'])
+                args.extend(['ipv4.addresses', f'{ip}/{cidr}'])
 
             gateway = ip_config.get('wifiGateway', '')
             if gateway:
-                cmd.extend(['ipv4.gateway', gateway])
+                args.extend(['ipv4.gateway', gateway])
 
             dns1 = ip_config.get('wifiDns1', '')
             dns2 = ip_config.get('wifiDns2', '')
             dns_servers = ','.join(filter(None, [dns1, dns2]))
             if dns_servers:
-                cmd.extend(['ipv4.dns', dns_servers])
+                args.extend(['ipv4.dns', dns_servers])
 
         # Execute
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = _run_nmcli(args, timeout=30)
 
         if result.returncode == 0:
             logging.info(f'created/updated NetworkManager connection: {conn_name}')
@@ -410,31 +735,38 @@ def _nm_create_or_update_connection(ssid, psk, interface, priority, ip_config):
 def _nm_delete_motioneye_connections():
     """
     Delete all motionEye-managed WiFi connections from NetworkManager.
+    Returns True if none are left behind.
     """
     try:
-        result = subprocess.run(
-            ['nmcli', '-t', '-f', 'NAME,TYPE', 'connection', 'show'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        result = _run_nmcli(['-t', '-f', 'NAME,TYPE', 'connection', 'show'])
         if result.returncode != 0:
-            return
+            logging.error(f'failed to list NetworkManager connections: {result.stderr}')
+            return False
 
-        for line in result.stdout.splitlines():
-            parts = line.split(':')
-            if len(parts) >= 2:
-                conn_name = parts[0]
-                if conn_name.startswith(NM_CONNECTION_PREFIX):
-                    subprocess.run(
-                        ['nmcli', 'connection', 'delete', conn_name],
-                        capture_output=True,
-                        timeout=10
-                    )
-                    logging.debug(f'deleted NetworkManager connection: {conn_name}')
+        conn_names = []
+        for parts in _nmcli_terse_rows(result.stdout):
+            if len(parts) >= 2 and parts[0].startswith(NM_CONNECTION_PREFIX):
+                conn_names.append(parts[0])
+
+        if not conn_names:
+            return True
+
+        # nmcli deletes several connections in one call
+        # (prefixed with "id" so names aren't taken as keywords)
+        args = ['connection', 'delete']
+        for conn_name in conn_names:
+            args += ['id', conn_name]
+        result = _run_nmcli(args)
+        if result.returncode != 0:
+            logging.error(f'failed to delete NetworkManager connections: {result.stderr}')
+            return False
+
+        logging.debug(f'deleted NetworkManager connections: {", ".join(conn_names)}')
+        return True
 
     except Exception as e:
         logging.error(f'error deleting NetworkManager connections: {e}')
+        return False
 
 
 def _nm_read_ip_config(interface):
@@ -455,16 +787,10 @@ def _nm_read_ip_config(interface):
 
     try:
         # Get active connection for interface
-        result = subprocess.run(
-            ['nmcli', '-t', '-f', 'NAME,DEVICE,TYPE', 'connection', 'show', '--active'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        result = _run_nmcli(['-t', '-f', 'NAME,DEVICE,TYPE', 'connection', 'show', '--active'])
 
         active_conn = None
-        for line in result.stdout.splitlines():
-            parts = line.split(':')
+        for parts in _nmcli_terse_rows(result.stdout):
             if len(parts) >= 3 and parts[1] == interface and '802-11-wireless' in parts[2]:
                 active_conn = parts[0]
                 break
@@ -505,42 +831,51 @@ def _dhcpcd_read_network_config(interface):
     if not interface:
         return config
 
-    dhcpcd_conf = '/etc/dhcpcd.conf'
-    if not os.path.exists(dhcpcd_conf):
+    if not os.path.exists(DHCPCD_CONF):
         return config
 
     try:
-        with open(dhcpcd_conf) as f:
-            content = f.read()
-
-        # Look for static IP configuration for this interface
-        pattern = rf'interface\s+{re.escape(interface)}\s*\n(.*?)(?=\ninterface\s|\Z)'
-        m = re.search(pattern, content, re.DOTALL)
-        if m:
-            block = m.group(1)
-
-            # Check for static IP
-            ip_match = re.search(r'static\s+ip_address\s*=\s*([\d.]+)(?:/(\d+))?', block)
-            if ip_match:
-                config['wifiUseDhcp'] = False
-                config['wifiIpAddress'] = ip_match.group(1)
-                if ip_match.group(2):
-                    cidr = int(ip_match.group(2))
-                    config['wifiNetmask'] = _cidr_to_netmask(cidr)
-
-            # Gateway
-            gw_match = re.search(r'static\s+routers\s*=\s*([\d.]+)', block)
-            if gw_match:
-                config['wifiGateway'] = gw_match.group(1)
-
-            # DNS
-            dns_match = re.search(r'static\s+domain_name_servers\s*=\s*([\d.\s]+)', block)
-            if dns_match:
-                dns_servers = dns_match.group(1).split()
-                if len(dns_servers) >= 1:
-                    config['wifiDns1'] = dns_servers[0]
-                if len(dns_servers) >= 2:
-                    config['wifiDns2'] = dns_servers[1]
+        with open(DHCPCD_CONF) as f:
+            # Single pass: skip lines until the interface's block starts
+            # and stop reading at the next "interface" line
+            in_block = False
+            for line in f:
+                parts = line.split()
+                if not parts or parts[0].startswith('#'):
+                    continue
+
+                if parts[0] == 'interface':
+                    if in_block:
+                        break
+                    in_block = parts[1:] == [interface]
+                    continue
+
+                if not in_block or parts[0] != 'static':
+                    continue
+
+                key, _, value = line.strip()[len('static'):].partition('=')
+                key = key.strip()
+                value = value.strip()
+
+                # Static IP
+                if key == 'ip_address' and value:
+                    ip, _, cidr = value.partition('/')
+                    config['wifiUseDhcp'] = False
+                    config['wifiIpAddress'] = ip
+                    if cidr.isdigit():
+                        config['wifiNetmask'] = _cidr_to_netmask(int(cidr))
+
+                # Gateway
+                elif key == 'routers' and value:
+                    config['wifiGateway'] = value.split()[0]
+
+                # DNS
+                elif key == 'domain_name_servers':
+                    dns_servers = value.split()
+                    if len(dns_servers) >= 1:
+                        config['wifiDns1'] = dns_servers[0]
+                    if len(dns_servers) >= 2:
+                        config['wifiDns2'] = dns_servers[1]
 
     except Exception as e:
         logging.debug(f'error reading dhcpcd.conf: {e}')
@@ -556,28 +891,27 @@ def _dhcpcd_write_network_config(interface, config):
         logging.warning('no WiFi interface specified for network config')
         return
 
-    dhcpcd_conf = '/etc/dhcpcd.conf'
-    if not os.path.exists(dhcpcd_conf):
-        logging.warning(f'{dhcpcd_conf} does not exist, cannot configure static IP')
+    if not os.path.exists(DHCPCD_CONF):
+        logging.warning(f'{DHCPCD_CONF} does not exist, cannot configure static IP')
         return
 
     try:
-        with open(dhcpcd_conf) as f:
+        with open(DHCPCD_CONF) as f:
             lines = f.readlines()
 
         # Remove existing configuration for this interface
         new_lines = []
         skip_block = False
         for line in lines:
-            stripped = line.strip()
-            if re.match(rf'interface\s+{re.escape(interface)}\s*$', stripped):
+            parts = line.split()
+            if parts == ['interface', interface]:
                 skip_block = True
                 continue
-            if skip_block and re.match(r'interface\s+\w+', stripped):
+            if skip_block and len(parts) >= 2 and parts[0] == 'interface':
                 skip_block = False
-            if skip_block and stripped and not stripped.startswith('#'):
+            if skip_block and parts and not parts[0].startswith('#'):
                 continue
-            if skip_block and not stripped:
+            if skip_block and not parts:
                 skip_block = False
             new_lines.append(line)
 
@@ -601,8 +935,7 @@ def _dhcpcd_write_network_config(interface, config):
             if dns_servers:
                 new_lines.append(f'static domain_name_servers={dns_servers}\n')
 
-        with open(dhcpcd_conf, 'w') as f:
-            f.writelines(new_lines)
+        _write_file_atomic(DHCPCD_CONF, ''.join(new_lines).encode())
 
         logging.info(f'updated dhcpcd.conf for {interface}')
 
@@ -619,53 +952,20 @@ def _wpa_read_networks():
     Read networks from wpa_supplicant.conf.
     Returns list of dicts with network info.
     """
-    networks = []
-
-    if not WPA_SUPPLICANT_CONF or not os.path.exists(WPA_SUPPLICANT_CONF):
-        return networks
+    if not WPA_SUPPLICANT_CONF:
+        return []
 
     try:
-        with open(WPA_SUPPLICANT_CONF) as f:
-            lines = f.readlines()
-
-        current_network = {}
-        in_section = False
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith('#'):
-                continue
-
-            if line.startswith('network=') or line == 'network={':
-                in_section = True
-                current_network = {'priority': 0}
+        networks, _ = _wpa_read()
 
-            elif line.startswith('}') and in_section:
-                in_section = False
-                if current_network.get('ssid'):
-                    networks.append(current_network)
-                current_network = {}
-
-            elif in_section:
-                m = re.search(r'ssid\s*=\s*"(.*?)"', line)
-                if m:
-                    current_network['ssid'] = m.group(1)
-
-                m = re.search(r'psk\s*=\s*"?([^"]*)"?', line)
-                if m:
-                    current_network['psk'] = m.group(1)
-
-                m = re.search(r'priority\s*=\s*(\d+)', line)
-                if m:
-                    current_network['priority'] = int(m.group(1))
-
-        # Sort by priority (higher = preferred)
-        networks.sort(key=lambda x: x.get('priority', 0), reverse=True)
+    except FileNotFoundError:
+        return []
 
     except Exception as e:
         logging.error(f'error reading wpa_supplicant.conf: {e}')
+        return []
 
-    return networks
+    return [dict(n) for n in networks]
 
 
 def _wpa_read_motioneye_config():
@@ -677,19 +977,15 @@ def _wpa_read_motioneye_config():
         'interface_fallback': '',
     }
 
-    if not WPA_SUPPLICANT_CONF or not os.path.exists(WPA_SUPPLICANT_CONF):
+    if not WPA_SUPPLICANT_CONF:
         return config
 
     try:
-        with open(WPA_SUPPLICANT_CONF) as f:
-            for line in f:
-                m = re.search(r'#\s*motioneye_interface\s*=\s*(\S+)', line)
-                if m:
-                    config['interface'] = m.group(1)
+        _, me_config = _wpa_read()
+        config.update(me_config)
 
-                m = re.search(r'#\s*motioneye_interface_fallback\s*=\s*(\S+)', line)
-                if m:
-                    config['interface_fallback'] = m.group(1)
+    except FileNotFoundError:
+        pass
 
     except Exception as e:
         logging.debug(f'error reading motioneye config from wpa_supplicant.conf: {e}')
@@ -697,6 +993,74 @@ def _wpa_read_motioneye_config():
     return config
 
 
+def _wpa_read():
+    """
+    Return the parsed wpa_supplicant.conf as (networks, motionEye config),
+    parsing the file again only when it has changed.
+    """
+    st = os.stat(WPA_SUPPLICANT_CONF)
+    return _wpa_parse(WPA_SUPPLICANT_CONF, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=4)
+def _wpa_parse(path, ino, mtime_ns, size):
+    """
+    Parse wpa_supplicant.conf in one pass. The file's stat fields are part of
+    the cache key, so a modified file is parsed again.
+    Networks are sorted by priority (higher = preferred).
+    """
+    networks = []
+    me_config = {}
+
+    with open(path) as f:
+        lines = f.readlines()
+
+    current_network = {}
+    in_section = False
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith('#'):
+            m = _WPA_ME_INTERFACE_RE.search(line)
+            if m:
+                me_config['interface'] = m.group(1)
+
+            m = _WPA_ME_INTERFACE_FALLBACK_RE.search(line)
+            if m:
+                me_config['interface_fallback'] = m.group(1)
+
+            continue
+
+        if line.startswith('network=') or line == 'network={':
+            in_section = True
+            current_network = {'priority': 0}
+
+        elif line.startswith('}') and in_section:
+            in_section = False
+            if current_network.get('ssid'):
+                networks.append(current_network)
+            current_network = {}
+
+        elif in_section:
+            key, _, value = line.partition('=')
+            key = key.strip()
+            value = value.strip()
+
+            if key == 'ssid':
+                # only quoted (text) SSIDs, not hex encoded ones
+                if len(value) >= 2 and value[0] == value[-1] == '"':
+                    current_network['ssid'] = value[1:-1]
+            elif key == 'psk':
+                current_network['psk'] = value.strip('"')
+            elif key == 'priority':
+                if value.isdigit():
+                    current_network['priority'] = int(value)
+
+    networks.sort(key=lambda x: x.get('priority', 0), reverse=True)
+
+    return networks, me_config
+
+
 def _wpa_write_config(settings_dict):
     """
     Write WiFi configuration to wpa_supplicant.conf.
@@ -706,31 +1070,36 @@ def _wpa_write_config(settings_dict):
 
     try:
         # Read existing file, preserving header
+        # (parsed as bytes in a single pass, lines are kept verbatim)
         header_lines = []
-        if os.path.exists(WPA_SUPPLICANT_CONF):
-            with open(WPA_SUPPLICANT_CONF) as f:
-                in_network = False
-                for line in f:
-                    stripped = line.strip()
-
-                    if stripped.startswith('network=') or stripped == 'network={':
-                        in_network = True
-                        continue
-                    if in_network:
-                        if stripped == '}':
-                            in_network = False
-                        continue
-                    if stripped.startswith('# motioneye_'):
-                        continue
-
-                    header_lines.append(line)
+        try:
+            with open(WPA_SUPPLICANT_CONF, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+
+        in_network = False
+        for line in data.splitlines(keepends=True):
+            stripped = line.strip()
+
+            if stripped.startswith(b'network='):
+                in_network = True
+                continue
+            if in_network:
+                if stripped == b'}':
+                    in_network = False
+                continue
+            if stripped.startswith(b'# motioneye_'):
+                continue
+
+            header_lines.append(line)
 
         # Remove trailing empty lines from header
         while header_lines and not header_lines[-1].strip():
             header_lines.pop()
 
         # Build new content
-        new_lines = header_lines[:]
+        new_lines = []
 
         # Add motioneye config comments
         new_lines.append(f'\n# motioneye_interface={settings_dict["wifiInterface"]}\n')
@@ -755,8 +1124,7 @@ def _wpa_write_config(settings_dict):
             ))
 
         # Write file
-        with open(WPA_SUPPLICANT_CONF, 'w') as f:
-            f.writelines(new_lines)
+        _write_file_atomic(WPA_SUPPLICANT_CONF, b''.join(header_lines) + ''.join(new_lines).encode())
 
         logging.info(f'wifi settings saved to {WPA_SUPPLICANT_CONF}')
 
@@ -764,31 +1132,69 @@ def _wpa_write_config(settings_dict):
         logging.error(f'error writing wpa_supplicant.conf: {e}')
 
 
-def _create_wpa_network_block(ssid, psk, priority=0):
+def _write_file_atomic(path, data):
     """
-    Create a wpa_supplicant network block.
+    Replace a file with new contents through a temporary file, so that a crash
+    mid-write never leaves a truncated file behind.
+    The temporary file is private and gets the original file's mode and owner,
+    as wpa_supplicant.conf holds the network keys.
     """
-    psk_is_hex = psk and re.match('^[a-f0-9]{64}$', psk, re.I) is not None
-    key_mgmt = 'NONE' if not psk else None
+    tmp_path = path + '.tmp'
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            _copy_mode_and_owner(path, fd)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
-    block = 'network={\n'
-    block += '    scan_ssid=1\n'
-    block += f'    ssid="{ssid}"\n'
+        os.replace(tmp_path, path)
 
-    if psk:
-        if psk_is_hex:
-            block += f'    psk={psk}\n'
-        else:
-            block += f'    psk="{psk}"\n'
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
-    if key_mgmt:
-        block += f'    key_mgmt={key_mgmt}\n'
+
+def _copy_mode_and_owner(path, fd):
+    """
+    Give the open file fd the mode and owner of path, if path exists.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return
+
+    os.fchmod(fd, st.st_mode & 0o7777)
+    try:
+        os.fchown(fd, st.st_uid, st.st_gid)
+    except PermissionError:
+        pass  # not running as root, the file stays ours
+
+
+def _create_wpa_network_block(ssid, psk, priority=0):
+    """
+    Create a wpa_supplicant network block.
+    """
+    lines = ['network={', '    scan_ssid=1', f'    ssid="{ssid}"']
+
+    if not psk:
+        lines.append('    key_mgmt=NONE')
+    elif _WPA_HEX_PSK_RE.fullmatch(psk):
+        lines.append(f'    psk={psk}')
+    else:
+        lines.append(f'    psk="{psk}"')
 
     if priority > 0:
-        block += f'    priority={priority}\n'
+        lines.append(f'    priority={priority}')
 
-    block += '}\n'
-    return block
+    lines.append('}\n')
+    return '\n'.join(lines)
 
 
 # ============================================================================
@@ -797,16 +1203,15 @@ def _create_wpa_network_block(ssid, psk, priority=0):
 
 def _cidr_to_netmask(cidr):
     """Convert CIDR notation to netmask."""
-    mask = (0xFFFFFFFF >> (32 - cidr)) << (32 - cidr)
-    return '.'.join([str((mask >> (8 * i)) & 0xFF) for i in range(3, -1, -1)])
+    mask = (0xFFFFFFFF << (32 - cidr)) & 0xFFFFFFFF
+    return f'{mask >> 24}.{(mask >> 16) & 0xFF}.{(mask >> 8) & 0xFF}.{mask & 0xFF}'
 
 
 def _netmask_to_cidr(netmask):
     """Convert netmask to CIDR notation."""
     try:
-        parts = [int(x) for x in netmask.split('.')]
-        binary = ''.join([bin(x)[2:].zfill(8) for x in parts])
-        return str(binary.count('1'))
+        a, b, c, d = map(int, netmask.split('.'))
+        return str(bin((a << 24) | (b << 16) | (c << 8) | d).count('1'))
     except Exception:
         return '24'
 
@@ -817,23 +1222,26 @@ def _netmask_to_cidr(netmask):
 
 def _get_wifi_settings():
     """
-    Get WiFi settings. Auto-detects and uses appropriate network manager.
+    Get WiFi settings, reusing the result of a read done less than
+    _WIFI_SETTINGS_CACHE_TTL seconds ago (e.g. by a previous page load).
     """
-    settings_dict = {
-        'wifiEnabled': False,
-        'wifiInterface': 'auto',
-        'wifiInterfaceFallback': '',
-        'wifiNetworkName': '',
-        'wifiNetworkKey': '',
-        'wifiNetworkFallback': '',
-        'wifiNetworkKeyFallback': '',
-        'wifiUseDhcp': True,
-        'wifiIpAddress': '',
-        'wifiNetmask': '255.255.255.0',
-        'wifiGateway': '',
-        'wifiDns1': '',
-        'wifiDns2': '',
-    }
+    global _wifi_settings_cache
+
+    now = time.monotonic()
+    if _wifi_settings_cache and now - _wifi_settings_cache[0] < _WIFI_SETTINGS_CACHE_TTL:
+        return dict(_wifi_settings_cache[1])
+
+    settings_dict = _read_wifi_settings()
+    _wifi_settings_cache = (now, settings_dict)
+
+    return dict(settings_dict)
+
+
+def _read_wifi_settings():
+    """
+    Read WiFi settings. Auto-detects and uses appropriate network manager.
+    """
+    settings_dict = dict(_WIFI_DEFAULTS)
 
     if not _is_wifi_configurable():
         return settings_dict
@@ -908,19 +1316,8 @@ def _set_wifi_settings(s):
     """
     Set WiFi settings. Auto-detects and uses appropriate network manager.
     """
-    s.setdefault('wifiEnabled', False)
-    s.setdefault('wifiInterface', 'auto')
-    s.setdefault('wifiInterfaceFallback', '')
-    s.setdefault('wifiNetworkName', '')
-    s.setdefault('wifiNetworkKey', '')
-    s.setdefault('wifiNetworkFallback', '')
-    s.setdefault('wifiNetworkKeyFallback', '')
-    s.setdefault('wifiUseDhcp', True)
-    s.setdefault('wifiIpAddress', '')
-    s.setdefault('wifiNetmask', '255.255.255.0')
-    s.setdefault('wifiGateway', '')
-    s.setdefault('wifiDns1', '')
-    s.setdefault('wifiDns2', '')
+    for key, value in _WIFI_DEFAULTS.items():
+        s.setdefault(key, value)
 
     if not _is_wifi_configurable():
         return
@@ -933,28 +1330,40 @@ def _set_wifi_settings(s):
 
     if nm_type == 'networkmanager':
         # Delete existing motionEye connections
-        _nm_delete_motioneye_connections()
+        deleted = _nm_delete_motioneye_connections()
 
         # Create new connections if enabled
+        # (the fallback network uses same IP config but lower priority)
+        networks = []
         if s['wifiEnabled'] and s['wifiNetworkName']:
-            _nm_create_or_update_connection(
-                ssid=s['wifiNetworkName'],
-                psk=s.get('wifiNetworkKey', ''),
-                interface=s['wifiInterface'],
-                priority=10,
-                ip_config=s
-            )
-
+            networks.append((s['wifiNetworkName'], s.get('wifiNetworkKey', ''), 10))
         if s['wifiEnabled'] and s.get('wifiNetworkFallback'):
-            # Fallback network uses same IP config but lower priority
-            _nm_create_or_update_connection(
-                ssid=s['wifiNetworkFallback'],
-                psk=s.get('wifiNetworkKeyFallback', ''),
+            networks.append((s['wifiNetworkFallback'], s.get('wifiNetworkKeyFallback', ''), 5))
+
+        def create_connection(network, replace=False):
+            ssid, psk, priority = network
+            return _nm_create_or_update_connection(
+                ssid=ssid,
+                psk=psk,
                 interface=s['wifiInterface'],
-                priority=5,
-                ip_config=s
+                priority=priority,
+                ip_config=s,
+                # if some old connections may be left, replace them rather
+                # than adding duplicates with the same name
+                replace=replace or not deleted
             )
 
+        # Once all motionEye connections are gone, the connections can be
+        # added right away. Each nmcli round-trip is slow; run them side by
+        # side unless both networks map to the same connection name, in
+        # which case the fallback replaces the primary one.
+        if len(networks) == 2 and networks[0][0] != networks[1][0]:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(create_connection, networks))
+        else:
+            for i, network in enumerate(networks):
+                create_connection(network, replace=i > 0)
+
         # Also write to wpa_supplicant.conf for interface fallback config
         _wpa_write_config(s)
 
@@ -969,6 +1378,8 @@ def _set_wifi_settings(s):
         if interface:
             _dhcpcd_write_network_config(interface, s)
 
+    invalidate_wifi_cache()
+
 
 # ============================================================================
 # Additional Config Definitions for UI
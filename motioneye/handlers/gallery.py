@@ -33,6 +33,8 @@ TODO: Implement actual gallery functionality
 """
 
 import datetime
+import gzip
+import json
 import logging
 import os
 from typing import Any, Dict, List, Optional
@@ -86,67 +88,13 @@ class GalleryHandler(BaseHandler):
         logging.debug(f'[PLACEHOLDER] rendering gallery for camera {camera_id}')
         
         # PLACEHOLDER: Return a simple message
-        self.set_header('Content-Type', 'text/html')
-        self.write('''
-<!DOCTYPE html>
-<html>
-<head>
-    <title>motionEye Gallery</title>
-    <style>
-        body { 
-            font-family: Arial, sans-serif; 
-            padding: 40px; 
-            background: #1a1a1a; 
-            color: #fff;
-        }
-        .placeholder {
-            background: #333;
-            border-radius: 8px;
-            padding: 40px;
-            text-align: center;
-            max-width: 600px;
-            margin: 0 auto;
-        }
-        h1 { color: #4CAF50; }
-        .todo-list {
-            text-align: left;
-            background: #222;
-            padding: 20px;
-            border-radius: 4px;
-            margin-top: 20px;
-        }
-        .todo-list li { margin: 8px 0; color: #aaa; }
-        .back-link {
-            display: inline-block;
-            margin-top: 20px;
-            color: #4CAF50;
-            text-decoration: none;
-        }
-    </style>
-</head>
-<body>
-    <div class="placeholder">
-        <h1>📷 Media Gallery</h1>
-        <p>This feature is under development.</p>
-        
-        <div class="todo-list">
-            <strong>Planned Features:</strong>
-            <ul>
-                <li>Grid view of captured images</li>
-                <li>Video playback</li>
-                <li>Date-based filtering</li>
-                <li>Calendar navigation</li>
-                <li>Timeline view</li>
-                <li>Bulk download/delete</li>
-                <li>Event grouping</li>
-            </ul>
-        </div>
-        
-        <a href="/" class="back-link">← Back to Dashboard</a>
-    </div>
-</body>
-</html>
-        ''')
+        self.set_header('Content-Type', 'text/html; charset=UTF-8')
+        self.set_header('Vary', 'Accept-Encoding')
+        if _accepts_gzip(self.request.headers.get('Accept-Encoding', '')):
+            self.set_header('Content-Encoding', 'gzip')
+            self.write(_GALLERY_HTML_GZ)
+        else:
+            self.write(_GALLERY_HTML)
     
     @BaseHandler.auth()
     async def _list_images(self, camera_id: int):
@@ -158,15 +106,8 @@ class GalleryHandler(BaseHandler):
         logging.debug(f'[PLACEHOLDER] listing images for camera {camera_id}')
         
         # PLACEHOLDER response
-        self.finish_json({
-            'status': 'placeholder',
-            'message': 'Image listing not implemented yet',
-            'camera_id': camera_id,
-            'images': [],
-            'total': 0,
-            'page': 1,
-            'per_page': 50,
-        })
+        self.set_header('Content-Type', 'application/json')
+        self.finish(_IMAGES_PLACEHOLDER_JSON % json.dumps(camera_id))
     
     @BaseHandler.auth()
     async def _list_videos(self, camera_id: int):
@@ -178,15 +119,8 @@ class GalleryHandler(BaseHandler):
         logging.debug(f'[PLACEHOLDER] listing videos for camera {camera_id}')
         
         # PLACEHOLDER response
-        self.finish_json({
-            'status': 'placeholder',
-            'message': 'Video listing not implemented yet',
-            'camera_id': camera_id,
-            'videos': [],
-            'total': 0,
-            'page': 1,
-            'per_page': 50,
-        })
+        self.set_header('Content-Type', 'application/json')
+        self.finish(_VIDEOS_PLACEHOLDER_JSON % json.dumps(camera_id))
     
     @BaseHandler.auth()
     async def _get_timeline(self, camera_id: int):
@@ -198,14 +132,8 @@ class GalleryHandler(BaseHandler):
         logging.debug(f'[PLACEHOLDER] getting timeline for camera {camera_id}')
         
         # PLACEHOLDER response
-        self.finish_json({
-            'status': 'placeholder',
-            'message': 'Timeline not implemented yet',
-            'camera_id': camera_id,
-            'events': [],
-            'start_date': None,
-            'end_date': None,
-        })
+        self.set_header('Content-Type', 'application/json')
+        self.finish(_TIMELINE_PLACEHOLDER_JSON % json.dumps(camera_id))
     
     @BaseHandler.auth()
     async def _api_list_media(self, camera_id: Optional[int] = None):
@@ -252,10 +180,112 @@ class GalleryHandler(BaseHandler):
         })
 
 
+# The placeholder page never changes: encode and compress it only once
+_GALLERY_HTML = '''<!DOCTYPE html>
+<html>
+<head>
+    <title>motionEye Gallery</title>
+    <style>
+        body { 
+            font-family: Arial, sans-serif; 
+            padding: 40px; 
+            background: #1a1a1a; 
+            color: #fff;
+        }
+        .placeholder {
+            background: #333;
+            border-radius: 8px;
+            padding: 40px;
+            text-align: center;
+            max-width: 600px;
+            margin: 0 auto;
+        }
+        h1 { color: #4CAF50; }
+        .todo-list {
+            text-align: left;
+            background: #222;
+            padding: 20px;
+            border-radius: 4px;
+            margin-top: 20px;
+        }
+        .todo-list li { margin: 8px 0; color: #aaa; }
+        .back-link {
+            display: inline-block;
+            margin-top: 20px;
+            color: #4CAF50;
+            text-decoration: none;
+        }
+    </style>
+</head>
+<body>
+    <div class="placeholder">
+        <h1>📷 Media Gallery</h1>
+        <p>This feature is under development.</p>
+        
+        <div class="todo-list">
+            <strong>Planned Features:</strong>
+            <ul>
+                <li>Grid view of captured images</li>
+                <li>Video playback</li>
+                <li>Date-based filtering</li>
+                <li>Calendar navigation</li>
+                <li>Timeline view</li>
+                <li>Bulk download/delete</li>
+                <li>Event grouping</li>
+            </ul>
+        </div>
+        
+        <a href="/" class="back-link">← Back to Dashboard</a>
+    </div>
+</body>
+</html>
+'''.encode('utf-8')
+_GALLERY_HTML_GZ = gzip.compress(_GALLERY_HTML, 9)
+
+# Pre-serialized placeholder responses (same output as finish_json()),
+# only the camera id is filled in per request
+_IMAGES_PLACEHOLDER_JSON = (
+    '{"status": "placeholder", "message": "Image listing not implemented yet", '
+    '"camera_id": %s, "images": [], "total": 0, "page": 1, "per_page": 50}'
+)
+_VIDEOS_PLACEHOLDER_JSON = (
+    '{"status": "placeholder", "message": "Video listing not implemented yet", '
+    '"camera_id": %s, "videos": [], "total": 0, "page": 1, "per_page": 50}'
+)
+_TIMELINE_PLACEHOLDER_JSON = (
+    '{"status": "placeholder", "message": "Timeline not implemented yet", '
+    '"camera_id": %s, "events": [], "start_date": null, "end_date": null}'
+)
+
+
 # ============================================================================
 # Gallery utility functions
 # ============================================================================
 
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Tell whether an Accept-Encoding header allows a gzip response,
+    honoring q-values (an explicit "gzip" entry takes precedence over "*").
+    """
+    qualities = {}
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+
+    if 'gzip' in qualities:
+        return qualities['gzip'] > 0
+
+    return qualities.get('*', 0) > 0
+
+
 def get_media_dates(camera_id: int) -> List[str]:
     """
     Get list of dates that have media for a camera.
@@ -18,36 +18,44 @@
 import logging
 
 from motioneye.handlers.base import BaseHandler
-from motioneye.update import get_update_status, list_remote_branches, perform_update
+from motioneye.update import (
+    get_update_status,
+    list_remote_branches,
+    perform_update,
+    run_git_task,
+)
 
 __all__ = ('UpdateHandler',)
 
 
 class UpdateHandler(BaseHandler):
     @BaseHandler.auth(admin=True)
-    def get(self):
+    async def get(self):
         logging.debug('listing versions')
 
         list_branches = self.get_argument('list_branches', '0').lower() in ('1', 'true', 'yes')
         repo_url = self.get_argument('repo_url', None)
         branch = self.get_argument('branch', None)
 
+        # both query the remote repository with git, which may take a while;
+        # run them in a thread so other requests are still served meanwhile
         if list_branches:
-            self.finish_json({'branches': list_remote_branches(repo_url=repo_url)})
+            branches = await run_git_task(list_remote_branches, repo_url=repo_url)
+            self.finish_json({'branches': branches})
             return
 
-        status = get_update_status(repo_url=repo_url, branch=branch)
+        status = await run_git_task(get_update_status, repo_url=repo_url, branch=branch)
 
         self.finish_json(status)
 
     @BaseHandler.auth(admin=True)
-    def post(self):
+    async def post(self):
         version = self.get_argument('version')
         repo_url = self.get_argument('repo_url', None)
         branch = self.get_argument('branch', None)
 
         logging.debug(f'performing update to version {version} (branch={branch}, repo={repo_url})')
 
-        result = perform_update(version, repo_url=repo_url, branch=branch)
+        result = await perform_update(version, repo_url=repo_url, branch=branch)
 
         self.finish_json(result)
@@ -16,11 +16,12 @@
 
 """Meeting backend integration helpers."""
 
+import contextlib
 import json
 import logging
 import os
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from tornado import httpclient
 from tornado.ioloop import IOLoop, PeriodicCallback
@@ -36,9 +37,18 @@ _DEFAULT_SETTINGS: Dict[str, Any] = {
     "api_base": "https://meeting.ygsoft.fr/api",
 }
 
+_DEVICE_KEY_RE = re.compile(r"[A-Za-z0-9_-]*")
+_API_BASE_RE = re.compile(r"https?://")
+_HEARTBEAT_BODY = json.dumps({"note": "motionEye heartbeat"})
+
 _settings: Optional[Dict[str, Any]] = None
 _heartbeat_callback: Optional[PeriodicCallback] = None
 
+# set by _batch(): settings are then saved (and the heartbeat restarted)
+# once when the batch ends instead of after each change
+_batching = False
+_batch_dirty = False
+
 
 def _settings_path() -> str:
     return os.path.join(settings.CONF_PATH, _SETTINGS_FILE_NAME)
@@ -62,6 +72,12 @@ def _load_settings() -> None:
     except Exception as e:
         logging.error(f"could not read meeting settings from '{path}': {e}")
 
+    # normalized here and by set_heartbeat_interval(), so that readers can use
+    # the stored value as is; an empty interval is stored as 0, which disables
+    # the heartbeat
+    interval = _settings.get("heartbeat_interval")
+    _settings["heartbeat_interval"] = _normalize_interval(interval) if interval else 0
+
 
 def _save_settings() -> None:
     path = _settings_path()
@@ -99,12 +115,41 @@ def _normalize_interval(value: Any) -> int:
 
 
 def _update_setting(name: str, value: Any) -> None:
+    global _batch_dirty
+
     settings_dict = _ensure_settings()
+    if settings_dict.get(name) == value:
+        return
+
     settings_dict[name] = value
+    if _batching:
+        _batch_dirty = True
+        return
+
     _save_settings()
     restart_heartbeat()
 
 
+@contextlib.contextmanager
+def _batch() -> Iterator[None]:
+    global _batching, _batch_dirty
+
+    if _batching:
+        yield
+        return
+
+    _batching = True
+    try:
+        yield
+
+    finally:
+        _batching = False
+        if _batch_dirty:
+            _batch_dirty = False
+            _save_settings()
+            restart_heartbeat()
+
+
 def get_device_key() -> str:
     return _ensure_settings().get("device_key", "")
 
@@ -114,7 +159,7 @@ def set_device_key(device_key: str) -> None:
         device_key = ""
 
     device_key = str(device_key).strip()
-    if not re.match(r"^[A-Za-z0-9_-]*$", device_key):
+    if not _DEVICE_KEY_RE.fullmatch(device_key):
         logging.error("invalid Meeting device key provided")
         return
 
@@ -134,7 +179,9 @@ def set_token(token: str) -> None:
 
 
 def get_heartbeat_interval() -> int:
-    return _normalize_interval(_ensure_settings().get("heartbeat_interval"))
+    # a stored 0 only means "disabled" to the heartbeat itself
+    interval = _ensure_settings()["heartbeat_interval"]
+    return interval or _DEFAULT_SETTINGS["heartbeat_interval"]
 
 
 def set_heartbeat_interval(interval: Any) -> None:
@@ -150,15 +197,49 @@ def set_api_base(api_base: str) -> None:
         api_base = _DEFAULT_SETTINGS["api_base"]
 
     api_base = str(api_base).strip() or _DEFAULT_SETTINGS["api_base"]
-    if not re.match(r"^https?://", api_base):
+    if not _API_BASE_RE.match(api_base):
         logging.error("invalid Meeting API base URL provided")
         return
 
     _update_setting("api_base", api_base.rstrip("/"))
 
 
+def update_settings(updates: Dict[str, Any]) -> None:
+    setters = {
+        "device_key": set_device_key,
+        "token": set_token,
+        "heartbeat_interval": set_heartbeat_interval,
+        "api_base": set_api_base,
+    }
+
+    with _batch():
+        for name, value in updates.items():
+            setter = setters.get(name)
+            if setter is None:
+                logging.error(f"unknown Meeting setting '{name}'")
+                continue
+
+            setter(value)
+
+
+def _get_meeting_config() -> Dict[str, Any]:
+    return {
+        "meeting_device_key": get_device_key(),
+        "meeting_token": get_token(),
+        "meeting_heartbeat_interval": get_heartbeat_interval(),
+        "meeting_api_base": get_api_base(),
+    }
+
+
+def _set_meeting_config(s: Dict[str, Any]) -> None:
+    update_settings(
+        {name[len("meeting_"):]: value for name, value in s.items()}
+    )
+
+
 async def _send_heartbeat() -> None:
-    meeting_settings = get_settings()
+    # only reads a few values, no need for the copy made by get_settings()
+    meeting_settings = _ensure_settings()
     device_key = meeting_settings.get("device_key")
     token = meeting_settings.get("token")
     interval = meeting_settings.get("heartbeat_interval", 0)
@@ -169,7 +250,6 @@ async def _send_heartbeat() -> None:
 
     api_base = meeting_settings.get("api_base") or _DEFAULT_SETTINGS["api_base"]
     url = f"{api_base}/devices/{device_key}/online"
-    payload = json.dumps({"note": "motionEye heartbeat"})
     headers = {
         "Content-Type": "application/json",
         "X-Meeting-Ssh-Token": token,
@@ -178,7 +258,7 @@ async def _send_heartbeat() -> None:
     request = httpclient.HTTPRequest(
         url=url,
         method="POST",
-        body=payload,
+        body=_HEARTBEAT_BODY,
         headers=headers,
         request_timeout=15,
         validate_cert=settings.VALIDATE_CERTS,
@@ -217,7 +297,7 @@ def restart_heartbeat() -> None:
         logging.debug("Meeting heartbeat disabled: waiting for credentials and interval")
         return
 
-    interval_ms = _normalize_interval(interval_seconds) * 1000
+    interval_ms = interval_seconds * 1000
     _heartbeat_callback = PeriodicCallback(
         lambda: IOLoop.current().spawn_callback(_send_heartbeat), interval_ms
     )
@@ -252,8 +332,9 @@ def meeting_device_key():
         "type": "str",
         "section": "meeting",
         "required": False,
-        "get": get_device_key,
-        "set": set_device_key,
+        "get": _get_meeting_config,
+        "set": _set_meeting_config,
+        "get_set_dict": True,
         "validate": "^[a-z0-9_-]+$",
     }
 
@@ -266,8 +347,9 @@ def meeting_token():
         "type": "pwd",
         "section": "meeting",
         "required": False,
-        "get": get_token,
-        "set": set_token,
+        "get": _get_meeting_config,
+        "set": _set_meeting_config,
+        "get_set_dict": True,
     }
 
 
@@ -281,8 +363,9 @@ def meeting_heartbeat_interval():
         "required": False,
         "unit": "s",
         "min": 5,
-        "get": get_heartbeat_interval,
-        "set": set_heartbeat_interval,
+        "get": _get_meeting_config,
+        "set": _set_meeting_config,
+        "get_set_dict": True,
     }
 
 
@@ -294,6 +377,7 @@ def meeting_api_base():
         "type": "str",
         "section": "meeting",
         "required": False,
-        "get": get_api_base,
-        "set": set_api_base,
+        "get": _get_meeting_config,
+        "set": _set_meeting_config,
+        "get_set_dict": True,
     }
@@ -107,10 +107,17 @@ def set(username, key, value):
     if _prefs is None:
         _load()
 
+    user_prefs = _prefs.setdefault(username, {})
     if key:
-        _prefs.setdefault(username, {})[key] = value
+        if key in user_prefs and user_prefs[key] == value:
+            return
+
+        user_prefs[key] = value
 
     else:
+        if user_prefs == value:
+            return
+
         _prefs[username] = value
 
     _save()
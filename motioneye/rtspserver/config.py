@@ -16,19 +16,34 @@
 
 """UI configuration for RTSP server settings."""
 
+import datetime
 import logging
+import operator
 import os
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tornado.ioloop import IOLoop
 
 from motioneye import settings
 from motioneye.config import additional_config, additional_section
-from motioneye.audioctl import detect_audio_devices, get_default_audio_device
+from motioneye.audioctl import detect_audio_devices_nowait, get_default_audio_device
+
+
+_rtsp_integration = None
 
 
 def _get_rtsp_integration():
-    """Lazy import of rtsp_integration to avoid circular imports."""
-    from motioneye.rtspserver import integration as rtsp_integration
-    return rtsp_integration
+    """Lazy import of rtsp_integration to avoid circular imports.
+
+    The module is imported on first use and kept, so later calls don't go
+    through the import machinery.
+    """
+    global _rtsp_integration
+
+    if _rtsp_integration is None:
+        from motioneye.rtspserver import integration as rtsp_integration
+        _rtsp_integration = rtsp_integration
+    return _rtsp_integration
 
 
 def _config_file_path() -> str:
@@ -38,73 +53,210 @@ def _config_file_path() -> str:
     return os.path.join(settings.CONF_PATH, "motioneye.conf")
 
 
+class _ConfigMirror:
+    """In-memory copy of the configuration file.
+
+    Settings are updated in memory and written back to disk in a single
+    pass, shortly after the last change, so that saving N settings from the
+    UI costs one file write instead of N read/rewrite cycles. Comments and
+    line order are preserved. If the file was changed by someone else in the
+    meantime, it is read again and the pending changes are applied on top.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._flush_handle = None
+        # changes not written yet, as {key: (name, value)}
+        self._pending: Dict[str, Tuple[str, Any]] = {}
+        self._load()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self) -> None:
+        self.lines: List[Optional[str]] = []
+        self.values: Dict[str, str] = {}
+        self.key_to_line_idx: Dict[str, int] = {}
+        self._file_text = ""  # contents of the file as last read or written
+        # (mtime, size) of the file as last read or written, to notice outside edits
+        self._file_stat = self._stat()
+        try:
+            with open(self.path, "r") as f:
+                self._file_text = f.read()
+            self.lines = self._file_text.splitlines()
+        except FileNotFoundError:
+            logging.info("config file %s missing, creating a new one", self.path)
+        except Exception as e:
+            logging.error("Could not read config file %s: %s", self.path, e)
+
+        for idx, line in enumerate(self.lines):
+            if not line or line.lstrip().startswith("#"):
+                continue
+            parts = line.split(" ", 1)
+            if len(parts) != 2:
+                continue
+
+            key = parts[0].upper()
+            previous = self.key_to_line_idx.get(key)
+            if previous is not None:
+                # The last occurrence wins when settings are loaded; drop the others
+                self.lines[previous] = None
+            self.key_to_line_idx[key] = idx
+            self.values[key] = parts[1]
+
+    def set(self, name: str, value: Any) -> None:
+        """Update a setting (None or empty string removes it) and schedule a write."""
+        if self._apply(name, value):
+            self._pending[name.upper()] = (name, value)
+            self._schedule_flush()
+
+    def _apply(self, name: str, value: Any) -> bool:
+        """Update a setting in memory; return False if it was already up to date."""
+        str_value = "" if value is None else str(value)
+        key = name.upper()
+        remove = str_value.strip() == ""
+        if self.values.get(key, "") == ("" if remove else str_value):
+            # Already up to date, typically when the whole settings page is saved
+            return False
+
+        idx = self.key_to_line_idx.get(key)
+        if remove:
+            if idx is not None:
+                self.lines[idx] = None
+                del self.key_to_line_idx[key]
+            self.values.pop(key, None)
+
+        else:
+            line = f"{name.lower()} {str_value}"
+            if idx is not None:
+                self.lines[idx] = line
+            else:
+                self.key_to_line_idx[key] = len(self.lines)
+                self.lines.append(line)
+            self.values[key] = str_value
+
+        return True
+
+    def _schedule_flush(self) -> None:
+        io_loop = IOLoop.current()
+        if self._flush_handle is not None:
+            io_loop.remove_timeout(self._flush_handle)
+        self._flush_handle = io_loop.add_timeout(
+            datetime.timedelta(seconds=_WRITE_DELAY), self.flush
+        )
+
+    def flush_now(self) -> None:
+        """Cancel the deferred write, if any, and write pending changes now."""
+        if self._flush_handle is not None:
+            IOLoop.current().remove_timeout(self._flush_handle)
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the configuration file now."""
+        self._flush_handle = None
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        except Exception:
+            logging.debug("Unable to ensure config directory exists: %s", self.path)
+
+        if self._stat() != self._file_stat:
+            # Edited outside motionEye since it was read; don't overwrite those edits
+            logging.info("config file %s changed on disk, reloading it", self.path)
+            self._load()
+            for name, value in self._pending.values():
+                self._apply(name, value)
+
+        text = "\n".join(line for line in self.lines if line is not None) + "\n"
+        if text == self._file_text:
+            # e.g. a setting changed and then changed back before the write
+            self._pending = {}
+            return
+
+        # Write a temporary file and swap it in, so that a crash mid-write
+        # never leaves a truncated configuration file behind
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._file_text = text
+            self._file_stat = self._stat()
+            self._pending = {}
+        except Exception as e:
+            logging.error("Could not persist settings to %s: %s", self.path, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+# Delay used to coalesce config writes and RTSP restarts triggered by one save
+_WRITE_DELAY = 0.25
+
+_config_mirror: Optional[_ConfigMirror] = None
+_restart_handle = None
+
+
+def _get_config_mirror() -> _ConfigMirror:
+    """Return the configuration mirror, loading the file on first use."""
+    global _config_mirror
+
+    path = _config_file_path()
+    if _config_mirror is None or _config_mirror.path != path:
+        _config_mirror = _ConfigMirror(path)
+    return _config_mirror
+
+
 def _persist_setting(name: str, value: Any) -> None:
     """Persist a setting to the configuration file.
-    
+
+    The write is deferred by `_WRITE_DELAY` seconds and shared with any other
+    setting changed in the meantime.
+
     Args:
         name: Setting name
         value: Setting value (if None or empty string, the setting is removed)
     """
-    path = _config_file_path()
-    
-    # Convert value to string for comparison
-    str_value = "" if value is None else str(value)
-    is_empty = str_value.strip() == ""
-
-    try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-    except Exception:
-        logging.debug("Unable to ensure config directory exists: %s", path)
-
-    lines = []
-    try:
-        with open(path, "r") as f:
-            lines = f.read().splitlines()
-    except FileNotFoundError:
-        logging.info("config file %s missing, creating a new one", path)
-    except Exception as e:
-        logging.error("Could not read config file %s: %s", path, e)
-        return
+    _get_config_mirror().set(name, value)
 
-    updated = False
-    new_lines = []
-    for line in lines:
-        if not line or line.lstrip().startswith("#"):
-            new_lines.append(line)
-            continue
-
-        parts = line.split(" ", 1)
-        if len(parts) != 2:
-            new_lines.append(line)
-            continue
-
-        key, _ = parts
-        if key.upper() == name.upper():
-            if is_empty:
-                # Skip this line (remove the setting)
-                updated = True
-            else:
-                new_lines.append(f"{name.lower()} {str_value}")
-                updated = True
-        else:
-            new_lines.append(line)
 
-    # Only add new setting if it has a non-empty value
-    if not updated and not is_empty:
-        new_lines.append(f"{name.lower()} {str_value}")
+def flush_pending_settings() -> None:
+    """Write any deferred setting changes to the configuration file now.
 
-    try:
-        with open(path, "w") as f:
-            f.write("\n".join(new_lines) + "\n")
-    except Exception as e:
-        logging.error("Could not persist setting %s to %s: %s", name, path, e)
+    Called on shutdown, when the IO loop won't run the deferred write.
+    """
+    if _config_mirror is not None:
+        _config_mirror.flush_now()
 
 
-def _apply_and_restart() -> None:
-    """Apply changes and restart the RTSP server."""
+def _restart() -> None:
+    global _restart_handle
+
+    _restart_handle = None
     _get_rtsp_integration().restart()
 
 
+def _apply_and_restart() -> None:
+    """Apply changes and restart the RTSP server.
+
+    Several settings are usually changed by a single UI save; the restart is
+    deferred so that they all result in one restart.
+    """
+    global _restart_handle
+
+    io_loop = IOLoop.current()
+    if _restart_handle is not None:
+        io_loop.remove_timeout(_restart_handle)
+    _restart_handle = io_loop.add_timeout(datetime.timedelta(seconds=_WRITE_DELAY), _restart)
+
+
 def _bool(value: Any) -> bool:
     """Convert value to boolean."""
     return str(value).lower() in ("1", "true", "yes", "on")
@@ -115,16 +267,66 @@ def _get(key: str) -> Any:
     return getattr(settings, key, None)
 
 
+_UNSET = object()
+
+# Settings read by the RTSP server when it starts (see integration.get_rtsp_settings)
+_AFFECTS_SERVER = frozenset((
+    "RTSP_ENABLED",
+    "RTSP_PORT",
+    "RTSP_LISTEN",
+    "RTSP_AUDIO_ENABLED",
+    "RTSP_AUDIO_DEVICE",
+    "RTSP_VIDEO_BITRATE",
+    "RTSP_VIDEO_PRESET",
+))
+
+# Settings applied to the running server without restarting it
+_CREDENTIALS = frozenset(("RTSP_USERNAME", "RTSP_PASSWORD"))
+
+
+def _update(key: str, value: Any, persisted: Any) -> None:
+    """Store a setting, persist it and restart the server if needed.
+
+    Saving the UI calls every setter, most of them with the current value;
+    those are no-ops and don't rewrite the file or restart the server.
+    """
+    if getattr(settings, key, _UNSET) == value:
+        return
+
+    setattr(settings, key, value)
+    _persist_setting(key.lower(), persisted)
+    if key in _CREDENTIALS:
+        _get_rtsp_integration().update_credentials()
+    elif key in _AFFECTS_SERVER:
+        _apply_and_restart()
+
+
 def _set(key: str, value: Any) -> None:
     """Set a setting value and persist it."""
-    setattr(settings, key, value)
-    _persist_setting(key.lower(), value)
-    _apply_and_restart()
+    _update(key, value, value)
+
+
+def _getter(
+    key: str, coerce: Optional[Callable[[Any], Any]] = None, default: Any = None
+) -> Callable[[], Any]:
+    """Build a UI `get` callback for `settings.<key>`.
 
+    The callback returns `coerce(value)` when `coerce` is given, otherwise
+    the value itself or `default` when it is empty. The attribute getter is
+    bound once, when the config structure is built, rather than looked up
+    on every render.
+    """
+    get_value = operator.attrgetter(key)
+
+    if coerce is not None:
+        def getter():
+            return coerce(get_value(settings))
 
-def _get_optional_str(value: Any) -> str:
-    """Get optional string value."""
-    return "" if value is None else str(value)
+    else:
+        def getter():
+            return get_value(settings) or default
+
+    return getter
 
 
 def _set_optional_str(key: str, value: Any) -> None:
@@ -132,9 +334,40 @@ def _set_optional_str(key: str, value: Any) -> None:
     if value is None:
         value = ""
     value = str(value).strip()
-    setattr(settings, key, value or None)
-    _persist_setting(key.lower(), value or "")
-    _apply_and_restart()
+    _update(key, value or None, value)
+
+
+def _get_audio_device() -> str:
+    # Rendering the page must not block on detection: use the same
+    # (non-blocking) device list as the choices
+    return _get("RTSP_AUDIO_DEVICE") or get_default_audio_device(detect_audio_devices_nowait())
+
+
+def _set_audio_device(device: str) -> None:
+    _set("RTSP_AUDIO_DEVICE", device.strip() if device else get_default_audio_device())
+
+
+# Last rendered status text, keyed by the status values it was built from
+_status_text_cache: Optional[Tuple[Tuple, str]] = None
+
+
+def _get_status_text() -> str:
+    """Return the status panel text, rebuilt only when the status changed."""
+    global _status_text_cache
+
+    status = _get_rtsp_integration().get_server_status()
+    key = (status['running'], status['port'], tuple(status['streams']), status['sessions'])
+    if _status_text_cache is not None and _status_text_cache[0] == key:
+        return _status_text_cache[1]
+
+    if status['running']:
+        streams = ', '.join(status['streams']) if status['streams'] else 'none'
+        text = f"Running on port {status['port']} - Streams: {streams} - Sessions: {status['sessions']}"
+    else:
+        text = "Stopped"
+
+    _status_text_cache = (key, text)
+    return text
 
 
 # =============================================================================
@@ -163,7 +396,7 @@ def rtsp_enabled() -> Dict[str, Any]:
         "description": "Start the native RTSP server for streaming cameras.",
         "type": "bool",
         "section": "rtsp_server",
-        "get": lambda: _bool(_get("RTSP_ENABLED")),
+        "get": _getter("RTSP_ENABLED", _bool),
         "set": lambda enabled: _set("RTSP_ENABLED", _bool(enabled)),
     }
 
@@ -178,7 +411,7 @@ def rtsp_port() -> Dict[str, Any]:
         "section": "rtsp_server",
         "min": 1,
         "max": 65535,
-        "get": lambda: _get("RTSP_PORT") or 8554,
+        "get": _getter("RTSP_PORT", default=8554),
         "set": lambda port: _set("RTSP_PORT", int(port or 8554)),
     }
 
@@ -191,7 +424,7 @@ def rtsp_listen() -> Dict[str, Any]:
         "description": "IP address to listen on (0.0.0.0 for all interfaces).",
         "type": "str",
         "section": "rtsp_server",
-        "get": lambda: _get("RTSP_LISTEN") or "0.0.0.0",
+        "get": _getter("RTSP_LISTEN", default="0.0.0.0"),
         "set": lambda addr: _set("RTSP_LISTEN", addr or "0.0.0.0"),
     }
 
@@ -204,7 +437,7 @@ def rtsp_username() -> Dict[str, Any]:
         "description": "Username for RTSP authentication (leave empty to disable).",
         "type": "str",
         "section": "rtsp_server",
-        "get": lambda: _get_optional_str(_get("RTSP_USERNAME")),
+        "get": _getter("RTSP_USERNAME", default=""),
         "set": lambda username: _set_optional_str("RTSP_USERNAME", username),
     }
 
@@ -217,7 +450,7 @@ def rtsp_password() -> Dict[str, Any]:
         "description": "Password for RTSP authentication.",
         "type": "str",
         "section": "rtsp_server",
-        "get": lambda: _get_optional_str(_get("RTSP_PASSWORD")),
+        "get": _getter("RTSP_PASSWORD", default=""),
         "set": lambda password: _set_optional_str("RTSP_PASSWORD", password),
     }
 
@@ -230,7 +463,7 @@ def rtsp_audio_enabled() -> Dict[str, Any]:
         "description": "Include audio from microphone in RTSP streams.",
         "type": "bool",
         "section": "rtsp_server",
-        "get": lambda: _bool(_get("RTSP_AUDIO_ENABLED")),
+        "get": _getter("RTSP_AUDIO_ENABLED", _bool),
         "set": lambda enabled: _set("RTSP_AUDIO_ENABLED", _bool(enabled)),
     }
 
@@ -238,30 +471,14 @@ def rtsp_audio_enabled() -> Dict[str, Any]:
 @additional_config
 def rtsp_audio_device() -> Dict[str, Any]:
     """Audio input device selection for RTSP server."""
-    def get_device():
-        current = _get("RTSP_AUDIO_DEVICE")
-        if current:
-            return current
-        return get_default_audio_device()
-    
-    def set_device(device: str):
-        device = device.strip() if device else get_default_audio_device()
-        setattr(settings, "RTSP_AUDIO_DEVICE", device)
-        _persist_setting("rtsp_audio_device", device)
-        _apply_and_restart()
-    
-    def get_choices():
-        devices = detect_audio_devices()
-        return devices if devices else [("plug:default", "Default Audio Device")]
-    
     return {
         "label": "Audio Input Device",
         "description": "Select the microphone/audio capture device for RTSP audio.",
         "type": "choices",
         "section": "rtsp_server",
-        "choices": get_choices(),
-        "get": get_device,
-        "set": set_device,
+        "choices": detect_audio_devices_nowait,  # resolved lazily when the page is rendered
+        "get": _get_audio_device,
+        "set": _set_audio_device,
     }
 
 
@@ -275,7 +492,7 @@ def rtsp_video_bitrate() -> Dict[str, Any]:
         "section": "rtsp_server",
         "min": 500,
         "max": 10000,
-        "get": lambda: _get("RTSP_VIDEO_BITRATE") or 2000,
+        "get": _getter("RTSP_VIDEO_BITRATE", default=2000),
         "set": lambda bitrate: _set("RTSP_VIDEO_BITRATE", int(bitrate or 2000)),
     }
 
@@ -296,7 +513,7 @@ def rtsp_video_preset() -> Dict[str, Any]:
             ("fast", "Fast"),
             ("medium", "Medium"),
         ],
-        "get": lambda: _get("RTSP_VIDEO_PRESET") or "ultrafast",
+        "get": _getter("RTSP_VIDEO_PRESET", default="ultrafast"),
         "set": lambda preset: _set("RTSP_VIDEO_PRESET", preset or "ultrafast"),
     }
 
@@ -304,17 +521,10 @@ def rtsp_video_preset() -> Dict[str, Any]:
 @additional_config
 def rtsp_status() -> Dict[str, Any]:
     """RTSP server status (read-only info)."""
-    def get_status_text():
-        status = _get_rtsp_integration().get_server_status()
-        if status['running']:
-            streams = ', '.join(status['streams']) if status['streams'] else 'none'
-            return f"Running on port {status['port']} - Streams: {streams} - Sessions: {status['sessions']}"
-        return "Stopped"
-        
     return {
         "label": "Server Status",
         "description": "Current RTSP server status.",
         "type": "html",
         "section": "rtsp_server",
-        "get": get_status_text,
+        "get": _get_status_text,
     }
@@ -161,8 +161,7 @@ def stop():
         
     # Cleanup
     if _source_manager:
-        for camera_id in list(_source_manager.sources.keys()):
-            _source_manager.stop_source(camera_id)
+        _source_manager.stop_all()
         _source_manager = None
         
     _server = None
@@ -177,6 +176,19 @@ def restart():
     start()
 
 
+def update_credentials():
+    """Apply the RTSP credentials from settings to the running server.
+
+    Unlike `restart()`, this keeps the FFmpeg sources and client sessions.
+    """
+    if not is_running():
+        return
+
+    rtsp_settings = get_rtsp_settings()
+    _server.set_credentials(rtsp_settings['username'], rtsp_settings['password'])
+    logging.info("RTSP credentials updated")
+
+
 def _run_server_thread():
     """Run the server in its own thread."""
     global _loop
@@ -155,7 +155,8 @@ class SDPGenerator:
         lines.append("b=AS:2000")
         
         # a= media attributes
-        if codec.upper() == "H264":
+        codec_upper = codec.upper()
+        if codec_upper == "H264":
             # rtpmap for H.264
             lines.append(f"a=rtpmap:{payload_type} H264/{clock_rate}")
             
@@ -165,10 +166,10 @@ class SDPGenerator:
                 fmtp_parts.append(f"sprop-parameter-sets={sps_base64},{pps_base64}")
             lines.append(f"a=fmtp:{payload_type} {';'.join(fmtp_parts)}")
             
-        elif codec.upper() == "H265" or codec.upper() == "HEVC":
+        elif codec_upper in ("H265", "HEVC"):
             lines.append(f"a=rtpmap:{payload_type} H265/{clock_rate}")
             
-        elif codec.upper() == "MJPEG":
+        elif codec_upper == "MJPEG":
             lines.append(f"a=rtpmap:{payload_type} JPEG/{clock_rate}")
             
         lines.append(f"a=control:{control_url}")
@@ -693,6 +693,19 @@ class RTSPServer:
             
         return None
         
+    def set_credentials(self, username: Optional[str], password: Optional[str]):
+        """Change the authentication credentials of the running server.
+
+        Applies to new requests; established sessions are kept.
+
+        Args:
+            username: Username for authentication (None to disable)
+            password: Password for authentication
+        """
+        self.username = username
+        self.password = password
+        self.require_auth = bool(username and password)
+
     def check_credentials(self, username: str, password: str) -> bool:
         """Check if credentials are valid.
         
@@ -21,6 +21,7 @@ converting them to H.264 for RTSP streaming.
 """
 
 import asyncio
+import io
 import logging
 import subprocess
 import threading
@@ -74,6 +75,33 @@ def select_h264_encoder(fallback: str = "libx264") -> str:
     return fallback
 
 
+def _alsa_input_args(device: str) -> list:
+    """FFmpeg input options for capturing from an ALSA device."""
+    return ['-f', 'alsa', '-i', device]
+
+
+def _log_ffmpeg_stderr(stderr):
+    """Forward FFmpeg's stderr to the log, line by line, until it closes.
+
+    The pipe is opened unbuffered (for the binary output on stdout); it is
+    wrapped in a buffered reader here so that lines aren't read one byte
+    per system call.
+    """
+    try:
+        for line in io.BufferedReader(stderr):
+            line_text = line.decode('utf-8', errors='replace').strip()
+            if not line_text:
+                continue
+            # Log errors and warnings as WARNING for visibility
+            lower_text = line_text.lower()
+            if any(x in lower_text for x in ('error', 'warning', 'failed', 'invalid')):
+                logging.warning("FFmpeg: %s", line_text)
+            else:
+                logging.info("FFmpeg: %s", line_text)
+    except Exception:
+        pass
+
+
 class FFmpegTranscoder:
     """Transcodes MJPEG to H.264 using FFmpeg."""
     
@@ -115,12 +143,13 @@ class FFmpegTranscoder:
         Returns:
             True if started successfully
         """
-        ffmpeg_info = mediafiles.find_ffmpeg()
-        if not ffmpeg_info:
+        # find_ffmpeg() caches the probe once FFmpeg has been found; it returns
+        # (None, None, None) (not None) when it hasn't
+        binary, version, _ = mediafiles.find_ffmpeg()
+        if not binary:
             logging.error("FFmpeg not found, cannot start transcoder")
             return False
             
-        binary, version, _ = ffmpeg_info
         logging.info(f"Starting transcoder with ffmpeg {version} for {self.source_url}")
         
         self._running = True
@@ -163,27 +192,25 @@ class FFmpegTranscoder:
     
     def _read_stderr(self):
         """Read and log FFmpeg stderr output."""
-        while self._running and self._process and self._process.poll() is None:
-            try:
-                line = self._process.stderr.readline()
-                if line:
-                    line_text = line.decode('utf-8', errors='replace').strip()
-                    # Log errors and warnings as INFO for visibility
-                    if any(x in line_text.lower() for x in ['error', 'warning', 'failed', 'invalid']):
-                        logging.warning(f"FFmpeg: {line_text}")
-                    else:
-                        logging.info(f"FFmpeg: {line_text}")
-            except Exception:
-                break
+        _log_ffmpeg_stderr(self._process.stderr)
         logging.info(f"FFmpeg stderr reader stopped for camera {self.config.camera_id}")
             
-    def stop(self):
-        """Stop the transcoder."""
+    def terminate(self):
+        """Ask FFmpeg to exit, without waiting for it (see `stop()`)."""
         self._running = False
         
         if self._process:
             try:
                 self._process.terminate()
+            except Exception as e:
+                logging.error(f"Error terminating transcoder: {e}")
+
+    def stop(self):
+        """Stop the transcoder."""
+        self.terminate()
+
+        if self._process:
+            try:
                 self._process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 self._process.kill()
@@ -230,10 +257,7 @@ class FFmpegTranscoder:
         
         # Add audio input if enabled
         if self.config.audio_enabled and self.on_audio_samples:
-            cmd.extend([
-                '-f', 'alsa',
-                '-i', self.config.audio_device,
-            ])
+            cmd.extend(_alsa_input_args(self.config.audio_device))
             
         # Video encoding options
         # Ensure minimum output framerate for smooth streaming
@@ -424,6 +448,7 @@ class AudioCapture:
         self._process: Optional[subprocess.Popen] = None
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._stderr_thread: Optional[threading.Thread] = None
         
     def start(self) -> bool:
         """Start audio capture.
@@ -431,25 +456,12 @@ class AudioCapture:
         Returns:
             True if started successfully
         """
-        ffmpeg_info = mediafiles.find_ffmpeg()
-        if not ffmpeg_info:
+        binary, _, _ = mediafiles.find_ffmpeg()
+        if not binary:
             logging.error("FFmpeg not found for audio capture")
             return False
             
-        binary, _, _ = ffmpeg_info
-        
-        cmd = [
-            binary,
-            '-hide_banner',
-            '-loglevel', 'warning',
-            '-f', 'alsa',
-            '-i', self.device,
-            '-ac', str(self.channels),
-            '-ar', str(self.sample_rate),
-            '-acodec', 'pcm_mulaw',  # G.711 μ-law
-            '-f', 'mulaw',
-            'pipe:1',
-        ]
+        cmd = self._build_ffmpeg_command(binary)
         
         self._running = True
         
@@ -467,6 +479,15 @@ class AudioCapture:
             )
             self._thread.start()
             
+            # Drain stderr; an unread pipe would eventually block the capture
+            self._stderr_thread = threading.Thread(
+                target=_log_ffmpeg_stderr,
+                args=(self._process.stderr,),
+                daemon=True,
+                name="ffmpeg-audio-stderr",
+            )
+            self._stderr_thread.start()
+
             logging.info(f"Audio capture started on {self.device}")
             return True
             
@@ -475,13 +496,48 @@ class AudioCapture:
             self._running = False
             return False
             
-    def stop(self):
-        """Stop audio capture."""
+    def terminate(self):
+        """Ask FFmpeg to exit, without waiting for it (see `stop()`)."""
         self._running = False
         
         if self._process:
             try:
                 self._process.terminate()
+            except Exception:
+                pass
+
+    def _build_ffmpeg_command(self, binary: str) -> list:
+        """Build FFmpeg command line.
+
+        Args:
+            binary: FFmpeg binary path
+
+        Returns:
+            Command list
+        """
+        return [
+            binary,
+            '-hide_banner',
+            '-nostdin',
+            '-loglevel', 'warning',
+            '-fflags', 'nobuffer',
+            *_alsa_input_args(self.device),
+            '-ac', str(self.channels),
+            '-ar', str(self.sample_rate),
+            # G.711 μ-law is a table lookup per sample, far cheaper than AAC
+            '-acodec', 'pcm_mulaw',
+            '-f', 'mulaw',
+            # Hand each packet over right away instead of filling the output buffer first
+            '-flush_packets', '1',
+            'pipe:1',
+        ]
+
+    def stop(self):
+        """Stop audio capture."""
+        self.terminate()
+
+        if self._process:
+            try:
                 self._process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 self._process.kill()
@@ -494,6 +550,10 @@ class AudioCapture:
             self._thread.join(timeout=2)
             self._thread = None
             
+        if self._stderr_thread:
+            self._stderr_thread.join(timeout=2)
+            self._stderr_thread = None
+
     def _read_audio(self):
         """Read audio samples from FFmpeg."""
         # Read 160 samples at a time (20ms at 8kHz)
@@ -566,14 +626,8 @@ class VideoSourceManager:
         Args:
             camera_id: Camera identifier
         """
-        transcoder = self.sources.pop(camera_id, None)
-        if transcoder:
-            transcoder.stop()
-            
-        audio = self.audio_captures.pop(camera_id, None)
-        if audio:
-            audio.stop()
-            
+        self._stop([self.sources.pop(camera_id, None), self.audio_captures.pop(camera_id, None)])
+
         self._frame_callbacks.pop(camera_id, None)
         self._audio_callbacks.pop(camera_id, None)
         
@@ -597,13 +651,21 @@ class VideoSourceManager:
         Args:
             camera_id: Camera identifier
         """
-        transcoder = self.sources.get(camera_id)
-        if transcoder:
-            transcoder.stop()
-            
-        audio = self.audio_captures.get(camera_id)
-        if audio:
-            audio.stop()
+        self._stop([self.sources.get(camera_id), self.audio_captures.get(camera_id)])
+
+    def stop_all(self):
+        """Stop all video sources and audio captures."""
+        self._stop(list(self.sources.values()) + list(self.audio_captures.values()))
+
+    @staticmethod
+    def _stop(processes: list):
+        # Signal every FFmpeg process first so that they shut down in
+        # parallel, then wait for each of them
+        processes = [p for p in processes if p]
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.stop()
             
     def add_frame_callback(self, camera_id: int, callback: Callable[[bytes], None]):
         """Add a callback for video frames.
@@ -27,7 +27,7 @@ import time
 from tornado.ioloop import IOLoop
 from tornado.web import Application
 
-from motioneye import audioctl, meeting, settings, template
+from motioneye import meeting, settings, template
 from motioneye.controls import smbctl, v4l2ctl
 from motioneye.controls import wifictl  # Register WiFi/Network UI config
 from motioneye.controls import ledctl  # Register LED/Hardware UI config
@@ -418,7 +418,7 @@ def make_app(debug: bool = False) -> Application:
 
 def run():
     import motioneye
-    from motioneye import cleanup, mjpgclient, motionctl, tasks, wsswitch
+    from motioneye import audioctl, cleanup, mjpgclient, motionctl, tasks, wsswitch
     from motioneye.controls import smbctl
     from motioneye.rtspserver import integration as rtsp_integration
 
@@ -448,6 +448,8 @@ def run():
     meeting.start()
     logging.info('Meeting heartbeat scheduler started')
 
+    audioctl.warm_up()
+
     # Start native RTSP server
     rtsp_integration.start()
     if settings.RTSP_ENABLED:
@@ -480,6 +482,7 @@ def run():
     io_loop.start()
 
     logging.info(_('servilo haltis'))
+    rtsp_config.flush_pending_settings()
     tasks.stop()
     logging.info(_('taskoj haltis'))
 
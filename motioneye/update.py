@@ -15,10 +15,13 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import datetime
+import functools
 import logging
 import re
 import shutil
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import cmp_to_key
 from pathlib import Path
 
@@ -30,6 +33,15 @@ from motioneye import utils
 REPO_ROOT = Path(__file__).resolve().parent.parent
 VENV_PYTHON = REPO_ROOT / '.venv' / 'bin' / 'python'
 
+# get_update_status() results, as {(repo_url, branch): (monotonic timestamp, status)}
+_update_status_cache = {}
+_update_status_generation = 0  # bumped when cached statuses become outdated
+_UPDATE_STATUS_CACHE_TTL = 60  # seconds
+
+# git operations on REPO_ROOT (fetch, checkout, pull...) must not overlap,
+# so all of them are queued on a single worker thread
+_git_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='git')
+
 
 def get_os_version():
     try:
@@ -124,6 +136,14 @@ def _git(*args):
     return utils.call_subprocess(['git', '-C', str(REPO_ROOT), *args])
 
 
+def run_git_task(func, *args, **kwargs):
+    """Run a function that calls git on the git worker thread, keeping it
+    off the IO loop. Returns an awaitable with its result."""
+    return ioloop.IOLoop.current().run_in_executor(
+        _git_executor, functools.partial(func, *args, **kwargs)
+    )
+
+
 def _read_remote_version(repo_url=None, branch=None):
     """Fetch remote and read VERSION from motioneye/__init__.py.
 
@@ -218,14 +238,19 @@ def list_remote_branches(repo_url=None):
 
 
 def get_source_update_status(repo_url=None, branch=None):
+    return _get_source_update_status(repo_url=repo_url, branch=branch)[0]
+
+
+def _get_source_update_status(repo_url=None, branch=None):
+    """Return the source update status and whether the remote could be checked."""
     if not _is_git_repo():
-        return None
+        return None, True
 
     try:
         current_branch = _git('rev-parse', '--abbrev-ref', 'HEAD')
     except Exception as exc:
         logging.warning('failed to detect current branch: %s', exc)
-        return None
+        return None, False
 
     target_branch = branch or current_branch
     remote = repo_url or _get_remote_url()
@@ -248,12 +273,14 @@ def get_source_update_status(repo_url=None, branch=None):
     current_revision = _git('rev-parse', '--short', 'HEAD')
 
     update_revision = None
+    checked = False
     if remote_ref:
         try:
             remote_revision = _git('rev-parse', '--short', remote_ref)
             # There's an update if remote is different from current HEAD
             if remote_revision != current_revision:
                 update_revision = remote_revision
+            checked = True
         except Exception as exc:
             logging.warning('failed to compare local and remote revisions: %s', exc)
 
@@ -262,7 +289,7 @@ def get_source_update_status(repo_url=None, branch=None):
         'current_version': f'{current_branch}@{current_revision}',
         'branch': target_branch,
         'repo_url': remote,
-    }
+    }, checked
 
 
 def perform_source_update(version=None, repo_url=None, branch=None):
@@ -299,12 +326,24 @@ def get_all_versions():
     return platformupdate.get_all_versions()
 
 
-def perform_update(version, repo_url=None, branch=None):
+async def perform_update(version, repo_url=None, branch=None):
     logging.info(f'updating to version {version}...')
 
-    source_status = get_source_update_status(repo_url=repo_url, branch=branch)
-    if source_status:
-        return perform_source_update(version, repo_url=repo_url, branch=branch)
+    # git and pip block for a long time, keep them off the IO loop
+    io_loop = ioloop.IOLoop.current()
+    _invalidate_update_status()
+    try:
+        source_status = await run_git_task(
+            get_source_update_status, repo_url=repo_url, branch=branch
+        )
+        if source_status:
+            return await run_git_task(
+                perform_source_update, version, repo_url=repo_url, branch=branch
+            )
+
+    finally:
+        # forget statuses read while the update was running
+        _invalidate_update_status()
 
     try:
         import platformupdate
@@ -316,13 +355,40 @@ def perform_update(version, repo_url=None, branch=None):
 
     # schedule the actual update for two seconds later,
     # since we want to be able to respond to the request right away
-    ioloop.IOLoop.current().add_timeout(
+    io_loop.add_timeout(
         datetime.timedelta(seconds=2), platformupdate.perform_update, version=version
     )
 
 
+def _invalidate_update_status():
+    global _update_status_generation
+
+    _update_status_generation += 1
+    _update_status_cache.clear()
+
+
 def get_update_status(repo_url=None, branch=None):
-    source_status = get_source_update_status(repo_url=repo_url, branch=branch)
+    # each check fetches from the remote; reuse recent results
+    # so that reopening the update page doesn't fetch again
+    key = (repo_url, branch)
+    now = time.monotonic()
+    cached = _update_status_cache.get(key)
+    if cached and now - cached[0] < _UPDATE_STATUS_CACHE_TTL:
+        return dict(cached[1])
+
+    generation = _update_status_generation
+    status, checked = _get_update_status(repo_url=repo_url, branch=branch)
+    # failed checks are retried on the next request; so are checks that
+    # overlapped an update, since they may describe the previous install
+    if checked and generation == _update_status_generation:
+        _update_status_cache[key] = (now, status)
+
+    return dict(status)
+
+
+def _get_update_status(repo_url=None, branch=None):
+    """Return the update status and whether it may be cached."""
+    source_status, checked = _get_source_update_status(repo_url=repo_url, branch=branch)
     current_version = motioneye.VERSION
 
     # If running from git, prefer version comparison using remote __init__.py
@@ -334,9 +400,9 @@ def get_update_status(repo_url=None, branch=None):
                 'current_version': current_version,
                 'branch': source_status.get('branch') or branch,
                 'repo_url': source_status.get('repo_url') or repo_url,
-            }
+            }, checked
         # fall back to commit comparison if no version diff
-        return source_status
+        return source_status, checked
 
     # Non-git installs: use platformupdate versions list
     versions = get_all_versions()
@@ -349,4 +415,4 @@ def get_update_status(repo_url=None, branch=None):
         'current_version': current_version,
         'branch': branch,
         'repo_url': repo_url,
-    }
+    }, checked
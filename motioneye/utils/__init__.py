@@ -190,6 +190,15 @@ def get_disk_usage(path):
     return used_size, total_size
 
 
+def read_small_file(path, size=256):
+    """Read the first bytes of a small sysfs/procfs file, unbuffered."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
 def is_local_motion_camera(config):
     """Tells if a camera is managed by the local motion instance."""
     return bool(
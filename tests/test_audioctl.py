@@ -0,0 +1,206 @@
+import signal
+import subprocess
+import threading
+import time
+import unittest
+from unittest import mock
+
+from motioneye import audioctl
+
+ARECORD_OUTPUT = """**** List of CAPTURE Hardware Devices ****
+card 1: HD5000 [Microsoft® LifeCam HD-5000], device 0: USB Audio [USB Audio]
+  Subdevices: 1/1
+  Subdevice #0: subdevice #0
+card 2: Device [USB PnP Sound Device], device 0: USB Audio [USB Audio]
+card 2: Device [USB PnP Sound Device], device 0: USB Audio [USB Audio]
+""".encode()
+
+
+class TestParseArecord(unittest.TestCase):
+    def test_parse_devices(self):
+        self.assertEqual(
+            [
+                ('plughw:1,0', 'Microsoft® LifeCam HD-5000'),
+                ('plughw:2,0', 'USB PnP Sound Device'),
+            ],
+            audioctl._parse_arecord(ARECORD_OUTPUT),
+        )
+
+    def test_parse_without_description(self):
+        self.assertEqual(
+            [('plughw:3,1', 'Card 3')],
+            audioctl._parse_arecord(b'card 3:, device 1: x\n'),
+        )
+
+    def test_parse_empty(self):
+        self.assertEqual([], audioctl._parse_arecord(b''))
+
+PROC_CARDS = """ 0 [PCH            ]: HDA-Intel - HDA Intel PCH
+                      HDA Intel PCH at 0xf7f10000 irq 31
+ 1 [HD5000         ]: USB-Audio - Microsoft® LifeCam HD-5000
+                      Microsoft Microsoft® LifeCam HD-5000 at usb-0000:00:14.0-1, high speed
+"""
+
+PROC_PCM = """00-00: ALC887-VD Analog : ALC887-VD Analog : playback 1 : capture 1
+00-03: HDMI 0 : HDMI 0 : playback 1
+01-00: USB Audio : USB Audio : capture 1
+"""
+
+
+class TestParseProcAsound(unittest.TestCase):
+    def test_parse_capture_devices(self):
+        self.assertEqual(
+            [
+                ('plughw:0,0', 'HDA Intel PCH'),
+                ('plughw:1,0', 'Microsoft® LifeCam HD-5000'),
+            ],
+            audioctl._parse_proc_asound(PROC_CARDS, PROC_PCM),
+        )
+
+    def test_parse_irregular_spacing(self):
+        self.assertEqual(
+            [('plughw:0,1', 'Card 0')],
+            audioctl._parse_proc_asound('', '00-01:a:b:capture 1\n'),
+        )
+
+    def test_parse_duplicates(self):
+        self.assertEqual(
+            [('plughw:1,0', 'Microsoft® LifeCam HD-5000')],
+            audioctl._parse_proc_asound(
+                PROC_CARDS, '01-00: a : b : capture 1\n01-00: c : d : capture 1\n'
+            ),
+        )
+
+    def test_parse_unknown_card(self):
+        self.assertEqual(
+            [('plughw:2,1', 'Card 2')],
+            audioctl._parse_proc_asound('', '02-01: x : y : capture 1\n'),
+        )
+
+
+class TestDetectAudioDevices(unittest.TestCase):
+    def setUp(self):
+        audioctl.invalidate_audio_devices()
+        patcher = mock.patch('motioneye.audioctl._read_proc_asound', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        audioctl.invalidate_audio_devices()
+        audioctl._arecord_timeout = audioctl._ARECORD_TIMEOUT
+        audioctl._arecord_backoff_until = 0.0
+
+    def _run(self, stdout, returncode=0):
+        process = mock.Mock(pid=1234, returncode=returncode)
+        process.communicate.return_value = (stdout, None)
+        return mock.patch('subprocess.Popen', return_value=process)
+
+    @mock.patch('motioneye.audioctl._ARECORD', '/usr/bin/arecord')
+    def test_detection_is_cached(self):
+        with self._run(ARECORD_OUTPUT) as run:
+            first = audioctl.detect_audio_devices()
+            second = audioctl.detect_audio_devices()
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, run.call_count)
+
+    @mock.patch('motioneye.audioctl._ARECORD', '/usr/bin/arecord')
+    def test_invalidate_forces_rescan(self):
+        with self._run(ARECORD_OUTPUT) as run:
+            audioctl.detect_audio_devices()
+            audioctl.invalidate_audio_devices()
+            audioctl.detect_audio_devices()
+
+        self.assertEqual(2, run.call_count)
+
+    @mock.patch('motioneye.audioctl._ARECORD', '/usr/bin/arecord')
+    def test_default_fallback(self):
+        with self._run(b'', returncode=1):
+            self.assertEqual(
+                [('plug:default', 'Default Audio Device')],
+                audioctl.detect_audio_devices(),
+            )
+            self.assertEqual('plug:default', audioctl.get_default_audio_device())
+
+    @mock.patch('motioneye.audioctl._ARECORD', '/usr/bin/arecord')
+    def test_concurrent_detection_scans_once(self):
+        def communicate(timeout=None):
+            time.sleep(0.1)
+            return ARECORD_OUTPUT, None
+
+        with self._run(ARECORD_OUTPUT) as popen:
+            popen.return_value.communicate.side_effect = communicate
+            threads = [
+                threading.Thread(target=audioctl.detect_audio_devices) for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(1, popen.call_count)
+
+    @mock.patch('motioneye.audioctl._ARECORD', '/usr/bin/arecord')
+    def test_empty_result_is_cached(self):
+        with self._run(b'', returncode=1) as popen:
+            audioctl.detect_audio_devices()
+            audioctl.detect_audio_devices()
+
+        self.assertEqual(1, popen.call_count)
+
+    def test_default_device_from_list(self):
+        self.assertEqual(
+            'plughw:2,0',
+            audioctl.get_default_audio_device(
+                [('plug:default', 'Default Audio Device'), ('plughw:2,0', 'USB')]
+            ),
+        )
+
+    @mock.patch('motioneye.audioctl._ARECORD', None)
+    def test_missing_arecord(self):
+        with self._run(ARECORD_OUTPUT) as run:
+            devices = audioctl.detect_audio_devices()
+
+        self.assertEqual([('plug:default', 'Default Audio Device')], devices)
+        run.assert_not_called()
+
+    @mock.patch('motioneye.audioctl._ARECORD', '/usr/bin/arecord')
+    def test_nowait_schedules_background_scan(self):
+        with self._run(ARECORD_OUTPUT):
+            self.assertEqual(
+                [('plug:default', 'Default Audio Device')],
+                audioctl.detect_audio_devices_nowait(),
+            )
+            audioctl._detect_future.result(timeout=5)
+            self.assertEqual(
+                audioctl._parse_arecord(ARECORD_OUTPUT),
+                audioctl.detect_audio_devices_nowait(),
+            )
+
+    @mock.patch('motioneye.audioctl._ARECORD', '/usr/bin/arecord')
+    @mock.patch('os.killpg')
+    def test_timeout_kills_and_backs_off(self, killpg):
+        with self._run(ARECORD_OUTPUT) as popen:
+            popen.return_value.communicate.side_effect = subprocess.TimeoutExpired(
+                'arecord', audioctl._ARECORD_TIMEOUT
+            )
+            devices = audioctl.detect_audio_devices()
+            audioctl.invalidate_audio_devices()
+            audioctl.detect_audio_devices()
+
+        self.assertEqual([('plug:default', 'Default Audio Device')], devices)
+        killpg.assert_called_once_with(1234, signal.SIGKILL)
+        self.assertEqual(1, popen.call_count)
+
+    @mock.patch('motioneye.audioctl._ARECORD', '/usr/bin/arecord')
+    def test_proc_asound_avoids_arecord(self):
+        audioctl._read_proc_asound.return_value = [('plughw:1,0', 'USB')]
+        with self._run(ARECORD_OUTPUT) as popen:
+            devices = audioctl.detect_audio_devices()
+
+        self.assertEqual([('plughw:1,0', 'USB')], devices)
+        popen.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from unittest import mock
+
+from motioneye import config, settings
+from motioneye.controls import netstoragectl
+
+
+class TestAdditionalConfig(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(settings, 'ENABLE_REBOOT', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        config.invalidate()
+        self.addCleanup(config.invalidate)
+
+    def test_shared_getter_called_once_per_render(self):
+        getter = mock.Mock(wraps=netstoragectl._get_network_storage_settings)
+        _, configs = config.get_additional_structure(camera=False)
+        for c in configs.values():
+            if c.get('get') is netstoragectl._get_network_storage_settings:
+                c['get'] = getter
+
+        data = {}
+        config._get_additional_config(data)
+
+        self.assertEqual(1, getter.call_count)
+        self.assertIn('@_network_storage_server', data)
+
+
+if __name__ == '__main__':
+    unittest.main()
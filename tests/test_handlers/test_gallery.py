@@ -0,0 +1,17 @@
+import unittest
+
+from motioneye.handlers.gallery import _accepts_gzip
+
+
+class AcceptsGzipTest(unittest.TestCase):
+    def test_accepted(self):
+        for header in ('gzip', 'deflate, gzip;q=0.5', 'br, *', 'GZIP ; q=1'):
+            self.assertTrue(_accepts_gzip(header), header)
+
+    def test_refused(self):
+        for header in ('', 'identity', 'gzip;q=0', 'x-gzip2', '*;q=0', '*, gzip;q=0'):
+            self.assertFalse(_accepts_gzip(header), header)
+
+
+if __name__ == '__main__':
+    unittest.main()
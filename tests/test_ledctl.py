@@ -0,0 +1,27 @@
+import unittest
+from unittest import mock
+
+from motioneye.controls import ledctl
+
+
+class TestProbeRaspberryPiModel(unittest.TestCase):
+    @mock.patch('motioneye.controls.ledctl.read_small_file')
+    def test_first_readable_path_decides(self, read_small_file):
+        read_small_file.return_value = b'Generic DT based system\x00'
+
+        self.assertFalse(ledctl._probe_raspberry_pi_model())
+        read_small_file.assert_called_once_with('/proc/device-tree/model')
+
+    @mock.patch('motioneye.controls.ledctl.read_small_file')
+    def test_falls_back_to_sysfs_alias(self, read_small_file):
+        read_small_file.side_effect = [
+            FileNotFoundError(),
+            b'Raspberry Pi 4 Model B Rev 1.4\x00',
+        ]
+
+        self.assertTrue(ledctl._probe_raspberry_pi_model())
+        self.assertEqual(2, read_small_file.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from motioneye import meeting, settings
+
+
+class TestUpdateSettings(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+
+        for target, name, value in (
+            (settings, 'CONF_PATH', tmp_dir.name),
+            (meeting, '_settings', None),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(meeting, 'restart_heartbeat')
+        self.restart_heartbeat = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(
+            meeting, '_save_settings', wraps=meeting._save_settings
+        )
+        self.save_settings = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_form_save_writes_once(self):
+        meeting._set_meeting_config(
+            {
+                'meeting_device_key': 'cam-1',
+                'meeting_token': 'secret',
+                'meeting_heartbeat_interval': '30',
+                'meeting_api_base': 'https://example.com/api/',
+            }
+        )
+
+        self.assertEqual(1, self.save_settings.call_count)
+        self.assertEqual(1, self.restart_heartbeat.call_count)
+        with open(meeting._settings_path()) as f:
+            self.assertEqual(
+                {
+                    'device_key': 'cam-1',
+                    'token': 'secret',
+                    'heartbeat_interval': 30,
+                    'api_base': 'https://example.com/api',
+                },
+                json.load(f),
+            )
+
+    def test_unchanged_settings_not_saved(self):
+        meeting._set_meeting_config(meeting._get_meeting_config())
+
+        self.save_settings.assert_not_called()
+        self.restart_heartbeat.assert_not_called()
+        self.assertFalse(os.path.exists(meeting._settings_path()))
+
+    def test_invalid_value_skipped(self):
+        meeting.update_settings({'device_key': 'not valid!', 'token': 'secret'})
+
+        self.assertEqual('', meeting.get_device_key())
+        self.assertEqual('secret', meeting.get_token())
+        self.assertEqual(1, self.save_settings.call_count)
+
+    def test_loaded_interval_normalized(self):
+        with open(meeting._settings_path(), 'w') as f:
+            json.dump({'heartbeat_interval': '2'}, f)
+
+        self.assertEqual(5, meeting.get_heartbeat_interval())
+
+    def test_empty_interval_reported_as_default(self):
+        with open(meeting._settings_path(), 'w') as f:
+            json.dump({'heartbeat_interval': 0}, f)
+
+        self.assertEqual(60, meeting.get_heartbeat_interval())
+        self.assertEqual(0, meeting._ensure_settings()['heartbeat_interval'])
+
+
+if __name__ == '__main__':
+    unittest.main()
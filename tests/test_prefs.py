@@ -0,0 +1,31 @@
+import unittest
+from unittest import mock
+
+from motioneye import prefs
+
+
+class TestSet(unittest.TestCase):
+    def setUp(self):
+        for name, value in (('_prefs', {}), ('_save', mock.DEFAULT)):
+            patcher = mock.patch.object(prefs, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_unchanged_prefs_not_saved(self):
+        prefs.set('admin', None, {'layout_columns': 2})
+        prefs.set('admin', None, {'layout_columns': 2})
+        prefs.set('admin', 'layout_columns', 2)
+
+        self.assertEqual(1, prefs._save.call_count)
+
+    def test_changed_pref_saved(self):
+        prefs.set('admin', None, {'layout_columns': 2})
+        prefs.set('admin', 'layout_columns', 3)
+        prefs.set('admin', 'layout_rows', 1)
+
+        self.assertEqual(3, prefs._save.call_count)
+        self.assertEqual({'layout_columns': 3, 'layout_rows': 1}, prefs._prefs['admin'])
+
+
+if __name__ == '__main__':
+    unittest.main()
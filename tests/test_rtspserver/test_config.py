@@ -0,0 +1,158 @@
+# Copyright (c) 2025 motionEye contributors
+# This file is part of motionEye.
+
+"""Tests for RTSP server UI configuration persistence."""
+
+import os
+import tempfile
+from unittest import mock
+
+import tornado.gen
+import tornado.testing
+
+from motioneye import settings
+from motioneye.rtspserver import config as rtsp_config
+
+
+class TestConfigPersistence(tornado.testing.AsyncTestCase):
+    """Tests for the deferred configuration file writes."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'motioneye.conf')
+        with open(self.path, 'w') as f:
+            f.write('# comment\nrtsp_port 8554\nlisten 0.0.0.0\n')
+
+        self._config_file = settings.config_file
+        settings.config_file = self.path
+        rtsp_config._config_mirror = None
+
+        self._settings = {
+            key: getattr(settings, key)
+            for key in rtsp_config._AFFECTS_SERVER | rtsp_config._CREDENTIALS
+        }
+
+        self.integration = mock.Mock()
+        patcher = mock.patch.object(
+            rtsp_config, '_get_rtsp_integration', return_value=self.integration
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        settings.config_file = self._config_file
+        for key, value in self._settings.items():
+            setattr(settings, key, value)
+        rtsp_config._config_mirror = None
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def _read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    @tornado.testing.gen_test
+    async def test_settings_are_written_once(self):
+        rtsp_config._set('RTSP_PORT', 9000)
+        rtsp_config._set_optional_str('RTSP_USERNAME', 'user')
+        rtsp_config._set_optional_str('RTSP_USERNAME', '')
+        rtsp_config._set_optional_str('RTSP_PASSWORD', 'secret')
+
+        # nothing is written until the write delay expires
+        self.assertEqual('# comment\nrtsp_port 8554\nlisten 0.0.0.0\n', self._read())
+
+        await tornado.gen.sleep(rtsp_config._WRITE_DELAY * 2)
+
+        self.assertEqual(
+            '# comment\nrtsp_port 9000\nlisten 0.0.0.0\nrtsp_password secret\n',
+            self._read(),
+        )
+        self.assertEqual(1, self.integration.restart.call_count)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    @tornado.testing.gen_test
+    async def test_duplicate_keys_keep_last(self):
+        with open(self.path, 'w') as f:
+            f.write('rtsp_port 8554\nlisten 0.0.0.0\nrtsp_port 8555\n')
+        rtsp_config._config_mirror = None
+
+        self.assertEqual('8555', rtsp_config._get_config_mirror().values['RTSP_PORT'])
+        rtsp_config._set('RTSP_PORT', 9000)
+        await tornado.gen.sleep(rtsp_config._WRITE_DELAY * 2)
+
+        self.assertEqual('listen 0.0.0.0\nrtsp_port 9000\n', self._read())
+
+    @tornado.testing.gen_test
+    async def test_unchanged_setting_is_noop(self):
+        rtsp_config._set('RTSP_PORT', settings.RTSP_PORT)
+        rtsp_config._set_optional_str('RTSP_USERNAME', '')
+
+        await tornado.gen.sleep(rtsp_config._WRITE_DELAY * 2)
+
+        self.assertIsNone(rtsp_config._config_mirror)
+        self.integration.restart.assert_not_called()
+
+    def test_flush_pending_settings(self):
+        rtsp_config._set('RTSP_PORT', 9000)
+        rtsp_config.flush_pending_settings()
+
+        self.assertEqual('# comment\nrtsp_port 9000\nlisten 0.0.0.0\n', self._read())
+        self.assertIsNone(rtsp_config._config_mirror._flush_handle)
+
+    def test_unchanged_file_is_not_rewritten(self):
+        inode = os.stat(self.path).st_ino
+        rtsp_config._set('RTSP_PORT', 9000)
+        rtsp_config._set('RTSP_PORT', 8554)
+        rtsp_config.flush_pending_settings()
+
+        self.assertEqual(inode, os.stat(self.path).st_ino)
+
+    def test_mirror_ignores_existing_value(self):
+        mirror = rtsp_config._get_config_mirror()
+        mirror.set('rtsp_port', 8554)
+        mirror.set('rtsp_username', '')
+
+        self.assertIsNone(mirror._flush_handle)
+
+    @tornado.testing.gen_test
+    async def test_credentials_applied_without_restart(self):
+        rtsp_config._set_optional_str('RTSP_PASSWORD', 'secret')
+
+        await tornado.gen.sleep(rtsp_config._WRITE_DELAY * 2)
+
+        self.integration.update_credentials.assert_called_once_with()
+        self.integration.restart.assert_not_called()
+
+    def test_keys_match_case_insensitively(self):
+        with open(self.path, 'w') as f:
+            f.write('RTSP_PORT 8554\n')
+        rtsp_config._config_mirror = None
+
+        rtsp_config._set('RTSP_PORT', 9000)
+        rtsp_config.flush_pending_settings()
+
+        self.assertEqual('rtsp_port 9000\n', self._read())
+
+
+    def test_outside_edit_not_overwritten(self):
+        rtsp_config._set('RTSP_PORT', 9000)
+        with open(self.path, 'a') as f:
+            f.write('# edited by hand\nlisten 127.0.0.1\n')
+        rtsp_config.flush_pending_settings()
+
+        self.assertEqual(
+            '# comment\nrtsp_port 9000\n# edited by hand\nlisten 127.0.0.1\n',
+            self._read(),
+        )
+
+    def test_flush_now_without_pending_change(self):
+        mirror = rtsp_config._get_config_mirror()
+        inode = os.stat(self.path).st_ino
+        mirror.flush_now()
+
+        self.assertEqual(inode, os.stat(self.path).st_ino)
+
+
+if __name__ == '__main__':
+    tornado.testing.main()
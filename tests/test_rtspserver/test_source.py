@@ -0,0 +1,54 @@
+# Copyright (c) 2025 motionEye contributors
+# This file is part of motionEye.
+
+"""Tests for RTSP video sources."""
+
+import unittest
+from unittest import mock
+
+from motioneye.rtspserver.source import AudioCapture, VideoSourceManager
+
+
+class TestAudioCapture(unittest.TestCase):
+    """Tests for AudioCapture."""
+
+    def test_build_ffmpeg_command(self):
+        capture = AudioCapture(device='plughw:1,0')
+
+        self.assertEqual(
+            [
+                'ffmpeg', '-hide_banner', '-nostdin', '-loglevel', 'warning',
+                '-fflags', 'nobuffer', '-f', 'alsa', '-i', 'plughw:1,0',
+                '-ac', '1', '-ar', '8000', '-acodec', 'pcm_mulaw',
+                '-f', 'mulaw', '-flush_packets', '1', 'pipe:1',
+            ],
+            capture._build_ffmpeg_command('ffmpeg'),
+        )
+
+
+class TestVideoSourceManager(unittest.TestCase):
+    """Tests for VideoSourceManager."""
+
+    def test_stop_all_signals_before_waiting(self):
+        calls = mock.Mock()
+        manager = VideoSourceManager()
+        manager.sources = {1: calls.video1, 2: calls.video2}
+        manager.audio_captures = {1: calls.audio1}
+
+        manager.stop_all()
+
+        self.assertEqual(
+            [
+                mock.call.video1.terminate(),
+                mock.call.video2.terminate(),
+                mock.call.audio1.terminate(),
+                mock.call.video1.stop(),
+                mock.call.video2.stop(),
+                mock.call.audio1.stop(),
+            ],
+            calls.mock_calls,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
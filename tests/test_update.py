@@ -0,0 +1,101 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import tornado.testing
+
+from motioneye import update
+
+
+class TestGetUpdateStatus(tornado.testing.AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        update._update_status_cache.clear()
+        self.addCleanup(update._update_status_cache.clear)
+
+        patcher = mock.patch.object(
+            update, '_get_update_status', return_value=({'update_version': None}, True)
+        )
+        self.get_status = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_status_cached_per_branch(self):
+        update.get_update_status(branch='main')
+        update.get_update_status(branch='main')
+        update.get_update_status(branch='dev')
+
+        self.assertEqual(2, self.get_status.call_count)
+
+    def test_expired_status_checked_again(self):
+        update.get_update_status()
+        timestamp, status = update._update_status_cache[(None, None)]
+        update._update_status_cache[(None, None)] = (
+            timestamp - update._UPDATE_STATUS_CACHE_TTL,
+            status,
+        )
+        update.get_update_status()
+
+        self.assertEqual(2, self.get_status.call_count)
+
+    @tornado.testing.gen_test
+    async def test_update_clears_cache(self):
+        update.get_update_status()
+        with mock.patch.object(
+            update, 'get_source_update_status', return_value={'branch': 'main'}
+        ), mock.patch.object(
+            update, 'perform_source_update', return_value={'ok': True}
+        ):
+            await update.perform_update('main@1234567')
+        update.get_update_status()
+
+        self.assertEqual(2, self.get_status.call_count)
+
+    def test_failed_check_not_cached(self):
+        self.get_status.return_value = ({'update_version': None}, False)
+        update.get_update_status()
+        update.get_update_status()
+
+        self.assertEqual(2, self.get_status.call_count)
+
+    @tornado.testing.gen_test
+    async def test_status_read_during_update_not_kept(self):
+        def perform_source_update(*args, **kwargs):
+            update.get_update_status()
+            return {'ok': True}
+
+        with mock.patch.object(
+            update, 'get_source_update_status', return_value={'branch': 'main'}
+        ), mock.patch.object(
+            update, 'perform_source_update', side_effect=perform_source_update
+        ):
+            await update.perform_update('main@1234567')
+
+        self.assertEqual({}, update._update_status_cache)
+
+
+class TestRunGitTask(tornado.testing.AsyncTestCase):
+    @tornado.testing.gen_test
+    async def test_tasks_run_one_at_a_time(self):
+        running = []
+        overlaps = []
+
+        def task(name):
+            overlaps.append(bool(running))
+            running.append(name)
+            time.sleep(0.01)
+            running.remove(name)
+            return name
+
+        results = await asyncio.gather(
+            update.run_git_task(task, 'status'),
+            update.run_git_task(task, 'branches'),
+            update.run_git_task(task, 'update'),
+        )
+
+        self.assertEqual(['status', 'branches', 'update'], results)
+        self.assertEqual([False, False, False], overlaps)
+
+
+if __name__ == '__main__':
+    unittest.main()
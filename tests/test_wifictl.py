@@ -0,0 +1,577 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from motioneye.controls import wifictl
+
+
+class TestDetectNetworkManager(unittest.TestCase):
+    def setUp(self):
+        wifictl.invalidate_network_manager()
+
+    def tearDown(self):
+        wifictl.invalidate_network_manager()
+
+    @mock.patch('os.path.exists', return_value=False)
+    @mock.patch('motioneye.controls.wifictl._get_nmcli', return_value=None)
+    def test_negative_result_is_cached_briefly(self, get_nmcli, exists):
+        self.assertIsNone(wifictl._detect_network_manager())
+        self.assertIsNone(wifictl._detect_network_manager())
+        self.assertEqual(1, exists.call_count)
+
+        wifictl._network_manager_miss_time -= wifictl._NM_MISS_TTL
+        wifictl._detect_network_manager()
+        self.assertEqual(2, exists.call_count)
+
+        wifictl.invalidate_network_manager()
+        wifictl._detect_network_manager()
+        self.assertEqual(3, exists.call_count)
+
+    @mock.patch('os.path.exists', return_value=False)
+    @mock.patch('subprocess.run', side_effect=subprocess.TimeoutExpired('nmcli', 1))
+    @mock.patch('motioneye.controls.wifictl._get_nmcli', return_value='/usr/bin/nmcli')
+    def test_timed_out_probe_not_cached(self, get_nmcli, run, exists):
+        self.assertIsNone(wifictl._detect_network_manager())
+        self.assertIsNone(wifictl._detect_network_manager())
+        self.assertEqual(2, run.call_count)
+
+    @mock.patch('os.path.exists', return_value=True)
+    @mock.patch('subprocess.run', side_effect=OSError())
+    @mock.patch('motioneye.controls.wifictl._get_nmcli', return_value=None)
+    def test_dhcpcd_guess_not_cached(self, get_nmcli, run, exists):
+        self.assertEqual('dhcpcd', wifictl._detect_network_manager())
+        self.assertEqual('dhcpcd', wifictl._detect_network_manager())
+        self.assertEqual(2, run.call_count)
+
+    @mock.patch('subprocess.run')
+    @mock.patch('motioneye.controls.wifictl._get_nmcli', return_value='/usr/bin/nmcli')
+    def test_network_manager_is_cached(self, get_nmcli, run):
+        run.return_value = mock.Mock(returncode=0, stdout='running\n')
+
+        self.assertEqual('networkmanager', wifictl._detect_network_manager())
+        self.assertEqual('networkmanager', wifictl._detect_network_manager())
+        self.assertEqual(1, run.call_count)
+
+        wifictl.invalidate_wifi_cache()
+        wifictl._detect_network_manager()
+        self.assertEqual(2, run.call_count)
+
+
+class TestDetectWifiInterfaces(unittest.TestCase):
+    def setUp(self):
+        wifictl.invalidate_wifi_cache()
+
+    def tearDown(self):
+        wifictl.invalidate_wifi_cache()
+
+    @mock.patch('subprocess.run')
+    @mock.patch(
+        'motioneye.controls.wifictl._detect_wifi_interfaces_sysfs',
+        return_value=[('wlan0', 'brcmfmac', True)],
+    )
+    def test_sysfs_result_skips_commands(self, sysfs, run):
+        self.assertEqual([('wlan0', 'brcmfmac', True)], wifictl._detect_wifi_interfaces())
+        run.assert_not_called()
+
+    @mock.patch(
+        'motioneye.controls.wifictl._detect_wifi_interfaces_sysfs',
+        return_value=[('wlan0', 'brcmfmac', True)],
+    )
+    def test_result_is_cached(self, sysfs):
+        wifictl._detect_wifi_interfaces()
+        wifictl._detect_wifi_interfaces()
+        self.assertEqual(1, sysfs.call_count)
+
+        wifictl.invalidate_wifi_cache()
+        wifictl._detect_wifi_interfaces()
+        self.assertEqual(2, sysfs.call_count)
+
+    @mock.patch('motioneye.controls.wifictl._detect_wifi_interfaces_sysfs')
+    def test_expired_result_rereads_sysfs(self, sysfs):
+        sysfs.return_value = [('wlan0', 'brcmfmac', True)]
+        wifictl._detect_wifi_interfaces()
+        timestamp = wifictl._wifi_interfaces_cache[0] - wifictl._WIFI_CACHE_TTL
+        wifictl._wifi_interfaces_cache = (timestamp,) + wifictl._wifi_interfaces_cache[1:]
+
+        sysfs.return_value = [('wlan0', 'brcmfmac', False)]
+        self.assertEqual([('wlan0', 'brcmfmac', False)], wifictl._detect_wifi_interfaces())
+        self.assertEqual(2, sysfs.call_count)
+
+    @mock.patch('motioneye.controls.wifictl._list_net_interfaces')
+    @mock.patch('motioneye.controls.wifictl._detect_wifi_interfaces_nmcli', return_value=[])
+    @mock.patch(
+        'motioneye.controls.wifictl._detect_wifi_interfaces_iw',
+        return_value=[('wlan0-ap', 'unknown', True)],
+    )
+    @mock.patch('motioneye.controls.wifictl._detect_wifi_interfaces_sysfs', return_value=[])
+    def test_expired_fallback_renewed_when_interfaces_unchanged(self, sysfs, iw, nmcli, list_net):
+        list_net.return_value = frozenset(['lo', 'eth0', 'wlan0-ap'])
+        wifictl._detect_wifi_interfaces()
+        timestamp = wifictl._wifi_interfaces_cache[0] - wifictl._WIFI_CACHE_TTL
+        wifictl._wifi_interfaces_cache = (timestamp,) + wifictl._wifi_interfaces_cache[1:]
+
+        self.assertEqual([('wlan0-ap', 'unknown', True)], wifictl._detect_wifi_interfaces())
+        self.assertEqual(1, iw.call_count)
+        self.assertGreater(wifictl._wifi_interfaces_cache[0], timestamp)
+
+        wifictl._wifi_interfaces_cache = (timestamp,) + wifictl._wifi_interfaces_cache[1:]
+        list_net.return_value = frozenset(['lo', 'eth0', 'wlan0-ap', 'wlan1'])
+        wifictl._detect_wifi_interfaces()
+        self.assertEqual(2, iw.call_count)
+
+    @mock.patch('motioneye.controls.wifictl._get_nmcli', return_value=None)
+    @mock.patch('motioneye.controls.wifictl._detect_wifi_interfaces_sysfs', return_value=[])
+    @mock.patch('subprocess.run')
+    def test_iw_fallback(self, run, sysfs, get_nmcli):
+        run.return_value = mock.Mock(
+            returncode=0,
+            stdout='phy#0\n\tInterface wlan0-ap\n\t\tifindex 3\n',
+        )
+
+        self.assertEqual([('wlan0-ap', 'unknown', True)], wifictl._detect_wifi_interfaces())
+
+
+class TestSetWifiSettings(unittest.TestCase):
+    def setUp(self):
+        for name, value in (
+            ('_detect_network_manager', 'networkmanager'),
+            ('_nm_delete_motioneye_connections', True),
+            ('_wpa_write_config', None),
+        ):
+            patcher = mock.patch.object(wifictl, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(wifictl, '_nm_create_or_update_connection')
+        self.create = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _set(self, fallback):
+        wifictl._set_wifi_settings(
+            {
+                'wifiEnabled': True,
+                'wifiInterface': 'wlan0',
+                'wifiNetworkName': 'Home',
+                'wifiNetworkKey': 'home-key',
+                'wifiNetworkFallback': fallback,
+                'wifiNetworkKeyFallback': 'fallback-key',
+            }
+        )
+
+    def test_primary_and_fallback_created(self):
+        self._set('Office')
+
+        self.assertEqual(
+            [('Home', 'home-key', 10), ('Office', 'fallback-key', 5)],
+            sorted(
+                (c.kwargs['ssid'], c.kwargs['psk'], c.kwargs['priority'])
+                for c in self.create.call_args_list
+            ),
+        )
+        wifictl._nm_delete_motioneye_connections.assert_called_once_with()
+        self.assertFalse(any(c.kwargs['replace'] for c in self.create.call_args_list))
+
+    def test_same_ssid_created_in_order(self):
+        self._set('Home')
+
+        self.assertEqual(
+            [(10, False), (5, True)],
+            [(c.kwargs['priority'], c.kwargs['replace']) for c in self.create.call_args_list],
+        )
+
+    def test_failed_delete_replaces_connections(self):
+        wifictl._nm_delete_motioneye_connections.return_value = False
+        self._set('Office')
+
+        self.assertTrue(all(c.kwargs['replace'] for c in self.create.call_args_list))
+
+
+class TestGetWifiSettings(unittest.TestCase):
+    def setUp(self):
+        wifictl.invalidate_wifi_cache()
+        self.addCleanup(wifictl.invalidate_wifi_cache)
+
+        patcher = mock.patch.object(
+            wifictl, '_read_wifi_settings', return_value={'wifiNetworkName': 'Home'}
+        )
+        self.read = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_read_once_per_ttl(self):
+        settings_dict = wifictl._get_wifi_settings()
+        settings_dict['wifiNetworkName'] = 'changed'
+
+        self.assertEqual({'wifiNetworkName': 'Home'}, wifictl._get_wifi_settings())
+        self.assertEqual(1, self.read.call_count)
+
+    def test_expired_cache_read_again(self):
+        wifictl._get_wifi_settings()
+        timestamp = wifictl._wifi_settings_cache[0] - wifictl._WIFI_SETTINGS_CACHE_TTL
+        wifictl._wifi_settings_cache = (timestamp,) + wifictl._wifi_settings_cache[1:]
+        wifictl._get_wifi_settings()
+
+        self.assertEqual(2, self.read.call_count)
+
+    def test_invalidated_by_write(self):
+        wifictl._get_wifi_settings()
+        with mock.patch.object(wifictl, '_is_wifi_configurable', return_value=True), \
+                mock.patch.object(wifictl, '_detect_network_manager', return_value=None), \
+                mock.patch.object(wifictl, '_wpa_write_config'), \
+                mock.patch.object(wifictl, '_dhcpcd_write_network_config'):
+            wifictl._set_wifi_settings({'wifiEnabled': False, 'wifiInterface': 'wlan0'})
+        wifictl._get_wifi_settings()
+
+        self.assertEqual(2, self.read.call_count)
+
+
+NMCLI_DETAILS = '''connection.id:home
+connection.interface-name:wlan0
+802-11-wireless.ssid:Home
+802-11-wireless-security.psk:secret
+ipv4.method:manual
+ipv4.addresses:192.168.1.10/24
+ipv4.gateway:192.168.1.1
+ipv4.dns:1.1.1.1,8.8.8.8
+connection.id:uuid
+connection.interface-name:
+802-11-wireless.ssid:Office
+802-11-wireless-security.psk:
+ipv4.method:auto
+ipv4.addresses:
+ipv4.gateway:
+ipv4.dns:
+'''
+
+
+class TestNetworkManagerConnections(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(wifictl, '_get_nmcli', return_value='/usr/bin/nmcli')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_connection_details(self):
+        self.assertEqual(
+            [
+                {
+                    'name': 'home',
+                    'interface': 'wlan0',
+                    'ssid': 'Home',
+                    'psk': 'secret',
+                    'dhcp': False,
+                    'ip_address': '192.168.1.10',
+                    'netmask': '255.255.255.0',
+                    'gateway': '192.168.1.1',
+                    'dns1': '1.1.1.1',
+                    'dns2': '8.8.8.8',
+                },
+                {'name': 'uuid', 'ssid': 'Office', 'psk': '', 'dhcp': True},
+            ],
+            wifictl._nm_parse_connection_details(NMCLI_DETAILS),
+        )
+
+    @mock.patch('motioneye.controls.wifictl._get_dbus', return_value=None)
+    @mock.patch('subprocess.run')
+    def test_details_fetched_in_one_call(self, run, get_dbus):
+        run.side_effect = [
+            mock.Mock(
+                returncode=0,
+                stdout='home:802-11-wireless:wlan0:10\n'
+                'eth:802-3-ethernet:eth0:0\n'
+                'uuid:802-11-wireless::5\n',
+            ),
+            mock.Mock(returncode=0, stdout=NMCLI_DETAILS),
+        ]
+
+        connections = wifictl._nm_get_wifi_connections()
+
+        self.assertEqual(2, run.call_count)
+        self.assertEqual(
+            ['id', 'home', 'id', 'uuid'], run.call_args_list[1][0][0][-4:]
+        )
+        self.assertEqual(
+            [('home', 10), ('uuid', 5)],
+            [(c['name'], c['priority']) for c in connections],
+        )
+
+    @mock.patch('subprocess.run')
+    def test_delete_in_one_call(self, run):
+        run.return_value = mock.Mock(
+            returncode=0,
+            stdout='motioneye-wifi-Home:802-11-wireless\n'
+            'other:802-11-wireless\n'
+            'motioneye-wifi-Office:802-11-wireless\n',
+        )
+
+        wifictl._nm_delete_motioneye_connections()
+
+        self.assertEqual(2, run.call_count)
+        self.assertEqual(
+            ['/usr/bin/nmcli', 'connection', 'delete',
+             'id', 'motioneye-wifi-Home', 'id', 'motioneye-wifi-Office'],
+            run.call_args_list[1][0][0],
+        )
+
+    @mock.patch('subprocess.run')
+    def test_delete_name_with_colon(self, run):
+        run.return_value = mock.Mock(
+            returncode=0, stdout='motioneye-wifi-Cafe\\:2G:802-11-wireless\n'
+        )
+
+        wifictl._nm_delete_motioneye_connections()
+
+        self.assertEqual(
+            ['/usr/bin/nmcli', 'connection', 'delete', 'id', 'motioneye-wifi-Cafe:2G'],
+            run.call_args_list[1][0][0],
+        )
+
+    @mock.patch('subprocess.run')
+    def test_delete_nothing(self, run):
+        run.return_value = mock.Mock(returncode=0, stdout='other:802-11-wireless\n')
+
+        self.assertTrue(wifictl._nm_delete_motioneye_connections())
+
+        self.assertEqual(1, run.call_count)
+
+    @mock.patch('subprocess.run')
+    def test_delete_failure_reported(self, run):
+        run.side_effect = [
+            mock.Mock(returncode=0, stdout='motioneye-wifi-Home:802-11-wireless\n'),
+            mock.Mock(returncode=10, stdout='', stderr='error'),
+        ]
+
+        self.assertFalse(wifictl._nm_delete_motioneye_connections())
+
+    @mock.patch('subprocess.run')
+    def test_create_without_probe(self, run):
+        run.return_value = mock.Mock(returncode=0, stdout='', stderr='')
+
+        self.assertTrue(
+            wifictl._nm_create_or_update_connection(
+                'Home', 'home-key', 'wlan0', 10, {}, replace=False
+            )
+        )
+
+        self.assertEqual(1, run.call_count)
+        self.assertEqual(['/usr/bin/nmcli', 'connection', 'add'], run.call_args[0][0][:3])
+
+    def test_dbus_connection_info(self):
+        conn_settings = {
+            'connection': {
+                'id': 'home',
+                'type': '802-11-wireless',
+                'interface-name': 'wlan0',
+                'autoconnect-priority': 10,
+            },
+            '802-11-wireless': {'ssid': [72, 111, 109, 101]},
+            'ipv4': {
+                'method': 'manual',
+                'address-data': [{'address': '192.168.1.10', 'prefix': 24}],
+                'gateway': '192.168.1.1',
+                'dns': [0x01010101, 0x08080808],
+            },
+        }
+
+        self.assertEqual(
+            {
+                'name': 'home',
+                'ssid': 'Home',
+                'psk': 'secret',
+                'dhcp': False,
+                'priority': 10,
+                'interface': 'wlan0',
+                'ip_address': '192.168.1.10',
+                'netmask': '255.255.255.0',
+                'gateway': '192.168.1.1',
+                'dns1': '1.1.1.1',
+                'dns2': '8.8.8.8',
+            },
+            wifictl._nm_dbus_connection_info(conn_settings, 'secret'),
+        )
+
+
+WPA_SUPPLICANT = '''# motioneye_interface=wlan1
+# motioneye_interface_fallback=wlan0
+ctrl_interface=DIR=/var/run/wpa_supplicant GROUP=netdev
+
+network={
+    ssid="Office"
+    psk="office-key"
+    priority=5
+}
+
+network={
+    ssid="Home"
+    psk=0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef
+    priority=10
+}
+'''
+
+
+class TestWpaSupplicant(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = os.path.join(tmp_dir.name, 'wpa_supplicant.conf')
+        with open(path, 'w') as f:
+            f.write(WPA_SUPPLICANT)
+
+        patcher = mock.patch.object(wifictl, 'WPA_SUPPLICANT_CONF', path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_read_networks(self):
+        self.assertEqual(
+            [
+                {
+                    'ssid': 'Home',
+                    'psk': '0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef',
+                    'priority': 10,
+                },
+                {'ssid': 'Office', 'psk': 'office-key', 'priority': 5},
+            ],
+            wifictl._wpa_read_networks(),
+        )
+
+    def test_file_parsed_once_until_changed(self):
+        with mock.patch('builtins.open', wraps=open) as open_:
+            wifictl._wpa_read_networks()
+            wifictl._wpa_read_motioneye_config()
+            self.assertEqual(1, open_.call_count)
+
+            with open(wifictl.WPA_SUPPLICANT_CONF, 'a') as f:
+                f.write('# motioneye_interface=wlan2\n')
+            self.assertEqual('wlan2', wifictl._wpa_read_motioneye_config()['interface'])
+
+    def test_missing_file(self):
+        os.remove(wifictl.WPA_SUPPLICANT_CONF)
+
+        self.assertEqual([], wifictl._wpa_read_networks())
+        self.assertEqual('auto', wifictl._wpa_read_motioneye_config()['interface'])
+
+    def test_write_config_keeps_header_and_mode(self):
+        os.chmod(wifictl.WPA_SUPPLICANT_CONF, 0o600)
+
+        wifictl._wpa_write_config(
+            {
+                'wifiEnabled': True,
+                'wifiInterface': 'wlan0',
+                'wifiNetworkName': 'Cafe',
+                'wifiNetworkKey': 'cafe-key',
+            }
+        )
+
+        with open(wifictl.WPA_SUPPLICANT_CONF) as f:
+            content = f.read()
+
+        self.assertTrue(
+            content.startswith('ctrl_interface=DIR=/var/run/wpa_supplicant GROUP=netdev\n')
+        )
+        self.assertNotIn('Office', content)
+        self.assertIn('# motioneye_interface=wlan0\n', content)
+        self.assertIn('ssid="Cafe"', content)
+        self.assertEqual(0o600, os.stat(wifictl.WPA_SUPPLICANT_CONF).st_mode & 0o777)
+        self.assertFalse(os.path.exists(wifictl.WPA_SUPPLICANT_CONF + '.tmp'))
+
+    def test_create_network_block(self):
+        self.assertEqual(
+            'network={\n    scan_ssid=1\n    ssid="Home"\n    psk="secret"\n    priority=10\n}\n',
+            wifictl._create_wpa_network_block('Home', 'secret', 10),
+        )
+        self.assertEqual(
+            'network={\n    scan_ssid=1\n    ssid="Open"\n    key_mgmt=NONE\n}\n',
+            wifictl._create_wpa_network_block('Open', ''),
+        )
+        self.assertIn('    psk=' + 'ab' * 32 + '\n', wifictl._create_wpa_network_block('Hex', 'ab' * 32))
+
+    def test_read_motioneye_config(self):
+        self.assertEqual(
+            {'interface': 'wlan1', 'interface_fallback': 'wlan0'},
+            wifictl._wpa_read_motioneye_config(),
+        )
+
+
+DHCPCD = '''hostname
+clientid
+
+interface eth0
+static ip_address=10.0.0.2/8
+
+interface wlan0
+# static ip_address=192.168.1.99/24
+static ip_address = 192.168.1.10/24
+static routers=192.168.1.1
+static domain_name_servers=1.1.1.1 8.8.8.8
+
+interface wlan1
+static ip_address=172.16.0.2/16
+'''
+
+
+class TestDhcpcd(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, 'dhcpcd.conf')
+        with open(self.path, 'w') as f:
+            f.write(DHCPCD)
+
+        patcher = mock.patch.object(wifictl, 'DHCPCD_CONF', self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_read_network_config(self):
+        self.assertEqual(
+            {
+                'wifiUseDhcp': False,
+                'wifiIpAddress': '192.168.1.10',
+                'wifiNetmask': '255.255.255.0',
+                'wifiGateway': '192.168.1.1',
+                'wifiDns1': '1.1.1.1',
+                'wifiDns2': '8.8.8.8',
+            },
+            wifictl._dhcpcd_read_network_config('wlan0'),
+        )
+
+    def test_read_unconfigured_interface(self):
+        self.assertTrue(wifictl._dhcpcd_read_network_config('wlan2')['wifiUseDhcp'])
+
+    def test_write_network_config(self):
+        wifictl._dhcpcd_write_network_config(
+            'wlan0',
+            {
+                'wifiUseDhcp': False,
+                'wifiIpAddress': '192.168.1.20',
+                'wifiNetmask': '255.255.255.0',
+            },
+        )
+
+        with open(self.path) as f:
+            content = f.read()
+
+        self.assertNotIn('192.168.1.10', content)
+        self.assertIn('interface wlan1\nstatic ip_address=172.16.0.2/16\n', content)
+        self.assertTrue(
+            content.endswith('\ninterface wlan0\nstatic ip_address=192.168.1.20/24\n')
+        )
+        self.assertEqual(
+            '192.168.1.20', wifictl._dhcpcd_read_network_config('wlan0')['wifiIpAddress']
+        )
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+
+class TestNetmask(unittest.TestCase):
+    def test_cidr_to_netmask(self):
+        self.assertEqual('0.0.0.0', wifictl._cidr_to_netmask(0))
+        self.assertEqual('255.255.240.0', wifictl._cidr_to_netmask(20))
+        self.assertEqual('255.255.255.255', wifictl._cidr_to_netmask(32))
+
+    def test_netmask_to_cidr(self):
+        self.assertEqual('20', wifictl._netmask_to_cidr('255.255.240.0'))
+        self.assertEqual('32', wifictl._netmask_to_cidr('255.255.255.255'))
+        self.assertEqual('24', wifictl._netmask_to_cidr('invalid'))
+
+
+if __name__ == '__main__':
+    unittest.main()